@@ -8,7 +8,7 @@ from typing import Optional, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
-from .screen import get_screen_pixel_rgb
+from .screen import get_screen_pixel_rgb, release_screen_handle
 from .config import AppConfig, MainColor, ShadeButton, default_config_path, load_config, save_config
 from .image_processing import PixelGrid, load_and_resize_to_grid
 from .overlay import Marker, MarkersOverlay, PointResult, PointSelectOverlay, RectResult, RectSelectOverlay, StatusOverlay
@@ -56,6 +56,7 @@ class ClickCaptureResult:
 
 class WorkerSignals(QtCore.QObject):
     progress = QtCore.Signal(int, int)
+    progress_many = QtCore.Signal(object)
     status = QtCore.Signal(str)
     verify_cell = QtCore.Signal(int, int)
     bucket_base = QtCore.Signal(str, int, int, int, int, int)
@@ -159,6 +160,10 @@ class MainWindow(QtWidgets.QMainWindow):
         total = int(self._paint_total) if int(self._paint_total) > 0 else 1
         self._on_progress(int(x), int(y), total)
 
+    def _on_worker_progress_many(self, coords) -> None:
+        total = int(self._paint_total) if int(self._paint_total) > 0 else 1
+        self._on_progress_many(coords, total)
+
     def _on_worker_bucket_base(self, main_name: str, sx: int, sy: int, r: int, g: int, b: int) -> None:
         # Remember the base bucket-fill shade so Resume can keep using region-fill.
         self._paint_base_bucket_key = (str(main_name), (int(sx), int(sy)))
@@ -1313,6 +1318,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 signals.finished.emit()
             except Exception as e:
                 signals.error.emit(str(e))
+            finally:
+                release_screen_handle()
 
         threading.Thread(target=work, daemon=True).start()
 
@@ -1390,15 +1397,17 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_resume.setEnabled(False)
 
     def _on_progress(self, x: int, y: int, total: int):
+        self._on_progress_many(((x, y),), total)
+
+    def _on_progress_many(self, coords, total: int):
         # Progress callbacks can arrive out of order (Paint-by-Color) and can
         # repeat due to verification repaints. Track unique completed cells.
         if self._loaded is None:
             return
         if total > 0:
             self._paint_total = int(total)
-        key = (int(x), int(y))
-        if key not in self._paint_done:
-            self._paint_done.add(key)
+        cells = [(int(x), int(y)) for (x, y) in coords]
+        self._paint_done.update(cells)
 
         denom = max(1, int(self._paint_total) or int(total) or 1)
         pct = int((len(self._paint_done) / denom) * 100)
@@ -1412,7 +1421,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     ov.set_anchor_rect(self._game_window_rect)
                 if not ov.isVisible():
                     ov.start()
-                ov.mark_painted(int(x), int(y))
+                ov.mark_painted_many(cells)
             except Exception:
                 pass
 
@@ -1505,8 +1514,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     ov.set_anchor_rect(self._game_window_rect)
                 ov.set_grid(self._loaded.grid.w, self._loaded.grid.h, self._loaded.grid.pixels)
                 if resume and self._paint_done:
-                    for (xx, yy) in list(self._paint_done):
-                        ov.mark_painted(int(xx), int(yy))
+                    ov.mark_painted_many(list(self._paint_done))
                 if not ov.isVisible():
                     ov.start()
                 ov.set_status("Starting…")
@@ -1516,6 +1524,7 @@ class MainWindow(QtWidgets.QMainWindow):
         signals = WorkerSignals()
         qc = QtCore.Qt.ConnectionType.QueuedConnection
         signals.progress.connect(self._on_worker_progress, qc)
+        signals.progress_many.connect(self._on_worker_progress_many, qc)
         signals.status.connect(self._on_worker_status, qc)
         signals.verify_cell.connect(self._on_worker_verify_cell, qc)
         signals.bucket_base.connect(self._on_worker_bucket_base, qc)
@@ -1570,6 +1579,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     grid_w=self._loaded.grid.w,
                     grid_h=self._loaded.grid.h,
                     get_pixel=get_pixel,
+                    get_pixels=lambda: self._loaded.grid.pixels,
                     options=opts,
                     paint_mode=self._cfg.paint_mode,
                     skip=skip_fn,
@@ -1585,6 +1595,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     ),
                     bucket_base_cb=bucket_base_cb,
                     progress_cb=lambda x, y: signals.progress.emit(x, y),
+                    progress_many_cb=lambda coords: signals.progress_many.emit(list(coords)),
                     should_stop=lambda: self._stop_flag,
                     status_cb=status_cb,
                     verify_cb=verify_cb,
@@ -1601,6 +1612,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 signals.finished.emit()
             except Exception as e:
                 signals.error.emit(str(e))
+            finally:
+                release_screen_handle()
 
         threading.Thread(target=work, daemon=True).start()
 
@@ -6,7 +6,7 @@ from typing import Callable, Optional, Tuple
 
 from pynput import mouse
 
-from .screen import get_screen_pixel_rgb
+from .screen import get_screen_pixel_rgb, release_screen_handle
 
 
 Point = Tuple[int, int]
@@ -35,7 +35,12 @@ def capture_next_left_click_with_color(
         if stop_event.is_set():
             return False
         if button == mouse.Button.left and pressed:
-            rgb = get_screen_pixel_rgb(int(x), int(y))
+            try:
+                rgb = get_screen_pixel_rgb(int(x), int(y))
+            finally:
+                # The listener thread exits after this click; don't leave its
+                # mss handle behind.
+                release_screen_handle()
             stop_event.set()
             on_result(ClickCaptureResult(pos=(int(x), int(y)), rgb=rgb))
             return False
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import ctypes
+import sys
+from typing import Any, Optional
+
+import pyautogui
+
+
+# On Windows, talk to user32 directly: pyautogui does the same SetCursorPos /
+# mouse button calls underneath, but wraps every one of them in fail-safe
+# checks, pause handling and argument normalisation, which adds up when a
+# single paint run issues tens of thousands of clicks. Elsewhere (or if the
+# DLL can't be loaded) everything goes through pyautogui as before.
+
+_INPUT_MOUSE = 0
+_MOUSEEVENTF_LEFTDOWN = 0x0002
+_MOUSEEVENTF_LEFTUP = 0x0004
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.c_long),
+        ("dy", ctypes.c_long),
+        ("mouseData", ctypes.c_ulong),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    # MOUSEINPUT is the largest member of the Win32 INPUT union, so it alone
+    # gives the struct its correct size.
+    _fields_ = [("mi", _MOUSEINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("u", _INPUTUNION)]
+
+
+def _load_user32() -> Optional[Any]:
+    if sys.platform != "win32":
+        return None
+    try:
+        user32 = ctypes.WinDLL("user32", use_last_error=True)  # type: ignore[attr-defined]
+        user32.SetCursorPos.argtypes = (ctypes.c_int, ctypes.c_int)
+        user32.SendInput.argtypes = (ctypes.c_uint, ctypes.POINTER(_INPUT), ctypes.c_int)
+        user32.SendInput.restype = ctypes.c_uint
+        return user32
+    except Exception:
+        return None
+
+
+_user32 = _load_user32()
+
+# Button events are built once and re-sent; SendInput doesn't modify them.
+_LEFT_DOWN = (_INPUT * 1)(_INPUT(type=_INPUT_MOUSE, u=_INPUTUNION(mi=_MOUSEINPUT(dwFlags=_MOUSEEVENTF_LEFTDOWN))))
+_LEFT_UP = (_INPUT * 1)(_INPUT(type=_INPUT_MOUSE, u=_INPUTUNION(mi=_MOUSEINPUT(dwFlags=_MOUSEEVENTF_LEFTUP))))
+_INPUT_SIZE = ctypes.sizeof(_INPUT)
+
+
+def move_to(x: int, y: int, duration: float = 0.0) -> None:
+    """Move the pointer to (x, y).
+
+    Durations pyautogui would animate (above its MINIMUM_DURATION) still go
+    through pyautogui; shorter ones are an instant jump either way.
+    """
+
+    if _user32 is not None and duration <= getattr(pyautogui, "MINIMUM_DURATION", 0.1):
+        if pyautogui.FAILSAFE:
+            # Keep the corner abort that pyautogui would otherwise provide.
+            pyautogui.failSafeCheck()
+        _user32.SetCursorPos(int(x), int(y))
+        return
+    pyautogui.moveTo(x, y, duration=duration)
+
+
+def mouse_down() -> None:
+    if _user32 is not None:
+        _user32.SendInput(1, _LEFT_DOWN, _INPUT_SIZE)
+        return
+    pyautogui.mouseDown(button="left")
+
+
+def mouse_up() -> None:
+    if _user32 is not None:
+        _user32.SendInput(1, _LEFT_UP, _INPUT_SIZE)
+        return
+    pyautogui.mouseUp(button="left")
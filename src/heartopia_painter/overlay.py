@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
@@ -539,19 +539,26 @@ class StatusOverlay(QtWidgets.QWidget):
         self._request_update()
 
     def mark_painted(self, x: int, y: int) -> None:
+        self.mark_painted_many(((x, y),))
+
+    def mark_painted_many(self, coords: Iterable[Tuple[int, int]]) -> None:
         if self._base_img is None or self._painted_img is None or self._painted_mask is None:
             return
-        xx, yy = int(x), int(y)
-        if xx < 0 or yy < 0 or xx >= self._grid_w or yy >= self._grid_h:
-            return
-        idx = yy * self._grid_w + xx
-        if self._painted_mask[idx]:
-            return
-        self._painted_mask[idx] = 1
-        self._painted_count += 1
-        self._painted_img.setPixel(xx, yy, self._base_img.pixel(xx, yy))
-        self._paint_cursor = (xx, yy)
-        self._request_update()
+        changed = False
+        for x, y in coords:
+            xx, yy = int(x), int(y)
+            if xx < 0 or yy < 0 or xx >= self._grid_w or yy >= self._grid_h:
+                continue
+            idx = yy * self._grid_w + xx
+            if self._painted_mask[idx]:
+                continue
+            self._painted_mask[idx] = 1
+            self._painted_count += 1
+            self._painted_img.setPixel(xx, yy, self._base_img.pixel(xx, yy))
+            self._paint_cursor = (xx, yy)
+            changed = True
+        if changed:
+            self._request_update()
 
     def set_verify_cursor(self, x: int, y: int) -> None:
         xx, yy = int(x), int(y)
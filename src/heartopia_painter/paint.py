@@ -1,19 +1,32 @@
 from __future__ import annotations
 
-from collections import deque
+from array import array
+from bisect import bisect_left
+from collections import Counter, deque
+from itertools import repeat
 import time
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import pyautogui
 
 from .config import AppConfig, MainColor, ShadeButton
-from .screen import get_screen_pixel_rgb
+from .input import mouse_down, mouse_up, move_to
+from .screen import ScreenFrame, get_screen_pixel_rgb, get_screen_pixels_rgb, grab_screen_rect
 
+# Process-wide pyautogui settings, applied once on import: every click path
+# here does its own timing, so pyautogui's built-in pause after each call is
+# disabled, and moving the mouse to the top-left corner aborts a paint run.
+pyautogui.PAUSE = 0
+pyautogui.FAILSAFE = True
 
 Point = Tuple[int, int]
 RGB = Tuple[int, int, int]
 
+# _PaletteIndex LUT markers (real entries are palette indices, or -1 for "no palette").
+_LUT_UNSET = -2
+_LUT_MIXED = -3
+
 
 @dataclass
 class PainterOptions:
@@ -29,93 +42,77 @@ class PainterOptions:
     after_drag_delay_s: float = 0.02
 
 
-def _tap(pos: Point, opts: PainterOptions, extra_delay_s: float = 0.0):
-    # Move + mouseDown/mouseUp is more reliable for some games than pyautogui.click().
-    pyautogui.moveTo(pos[0], pos[1], duration=max(0.0, float(opts.move_duration_s)))
-    pyautogui.mouseDown(button="left")
-    time.sleep(max(0.0, float(opts.mouse_down_s)))
-    pyautogui.mouseUp(button="left")
-    time.sleep(max(0.0, float(opts.after_click_delay_s) + float(extra_delay_s)))
+# Waits shorter than this are skipped; the final stretch of longer ones is spun
+# rather than slept, since OS sleeps can overshoot by a whole timer tick.
+_MIN_WAIT_S = 0.001
+_SPIN_S = 0.001
 
 
-def _stroke(points: List[Point], opts: PainterOptions, should_stop: Optional[Callable[[], bool]] = None) -> None:
-    if not points:
+def _wait_until(deadline: float) -> None:
+    """Block until perf_counter() reaches deadline (sleep most of it, spin the rest)."""
+
+    remaining = deadline - time.perf_counter()
+    if remaining < _MIN_WAIT_S:
         return
-    # Some games respond better to a lower-level mouse controller than PyAutoGUI.
-    try:
-        from pynput.mouse import Button, Controller  # type: ignore
+    if remaining > _SPIN_S:
+        time.sleep(remaining - _SPIN_S)
+    while time.perf_counter() < deadline:
+        pass
 
-        mouse = Controller()
-        mouse.position = points[0]
-        mouse.press(Button.left)
-        time.sleep(max(0.0, float(opts.mouse_down_s)))
 
-        step = max(0.0, float(opts.drag_step_duration_s))
-        substeps_per_cell = 6
+def _tap(pos: Point, opts: PainterOptions, extra_delay_s: float = 0.0):
+    # Move + mouseDown/mouseUp is more reliable for some games than pyautogui.click().
+    move_to(pos[0], pos[1], duration=max(0.0, float(opts.move_duration_s)))
+    # Deadlines are taken before the input call so its own latency counts
+    # toward the hold / post-click delay instead of adding to it.
+    up_at = time.perf_counter() + max(0.0, float(opts.mouse_down_s))
+    mouse_down()
+    _wait_until(up_at)
+    done_at = time.perf_counter() + max(0.0, float(opts.after_click_delay_s) + float(extra_delay_s))
+    mouse_up()
+    _wait_until(done_at)
+
+
+def _tap_many(
+    points: Sequence[Point],
+    opts: PainterOptions,
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_point: Optional[Callable[[int], None]] = None,
+) -> bool:
+    """_tap() each point in order, with the option parsing hoisted out of the loop.
 
-        for target in points[1:]:
-            if should_stop and should_stop():
-                break
-            x0, y0 = mouse.position
-            x1, y1 = target
-            dx = x1 - x0
-            dy = y1 - y0
-
-            # Interpolate a few micro-moves per cell so the game receives
-            # continuous mouse-move events while the button is held.
-            n = max(1, int(substeps_per_cell))
-            for i in range(1, n + 1):
-                if should_stop and should_stop():
-                    break
-                mx = int(round(x0 + dx * (i / n)))
-                my = int(round(y0 + dy * (i / n)))
-                mouse.position = (mx, my)
-                if step > 0:
-                    time.sleep(step / n)
-
-        mouse.release(Button.left)
-        time.sleep(max(0.0, float(opts.after_drag_delay_s)))
-        return
-    except Exception:
-        # Fallback: PyAutoGUI drag
-        pass
+    on_point(i) runs after the i-th click; its exceptions propagate, as they
+    would from a per-cell _tap loop. Returns False if should_stop() fired.
+    """
 
-    pyautogui.moveTo(points[0][0], points[0][1], duration=max(0.0, float(opts.move_duration_s)))
-    pyautogui.mouseDown(button="left")
-    time.sleep(max(0.0, float(opts.mouse_down_s)))
-    try:
-        step = max(0.0, float(opts.drag_step_duration_s))
-        substeps_per_cell = 6
-        curx, cury = points[0]
-        for px, py in points[1:]:
-            if should_stop and should_stop():
-                return
-            dx = px - curx
-            dy = py - cury
-            n = max(1, int(substeps_per_cell))
-            for i in range(1, n + 1):
-                if should_stop and should_stop():
-                    return
-                mx = int(round(curx + dx * (i / n)))
-                my = int(round(cury + dy * (i / n)))
-                pyautogui.moveTo(mx, my, duration=0)
-                if step > 0:
-                    time.sleep(step / n)
-            curx, cury = px, py
-    finally:
-        pyautogui.mouseUp(button="left")
-    time.sleep(max(0.0, float(opts.after_drag_delay_s)))
+    move_s = max(0.0, float(opts.move_duration_s))
+    down_s = max(0.0, float(opts.mouse_down_s))
+    after_s = max(0.0, float(opts.after_click_delay_s))
+    now = time.perf_counter
+    for idx, (px, py) in enumerate(points):
+        if should_stop and should_stop():
+            return False
+        move_to(px, py, duration=move_s)
+        up_at = now() + down_s
+        mouse_down()
+        _wait_until(up_at)
+        done_at = now() + after_s
+        mouse_up()
+        _wait_until(done_at)
+        if on_point:
+            on_point(idx)
+    return True
 
 
 def _rapid_click_stroke(
-    points: List[Point],
+    points: Sequence[Point],
     opts: PainterOptions,
     should_stop: Optional[Callable[[], bool]] = None,
     on_point: Optional[Callable[[int], None]] = None,
 ) -> None:
     """Fast, reliable stroke: click every point in a run with reduced delays.
 
-    This is a fallback when true drag-painting doesn't register in-game.
+    Used in place of true drag-painting, which doesn't register in-game.
     We reuse the drag timing knobs as stroke timing:
     - drag_step_duration_s: delay between clicks within the stroke
     - after_drag_delay_s: delay after the stroke finishes
@@ -124,28 +121,30 @@ def _rapid_click_stroke(
     if not points:
         return
 
+    down_s = max(0.0, float(opts.mouse_down_s))
     per_click_delay = max(0.0, float(opts.drag_step_duration_s))
     after_stroke_delay = max(0.0, float(opts.after_drag_delay_s))
+    now = time.perf_counter
 
     for idx, (px, py) in enumerate(points):
         if should_stop and should_stop():
             return
         # Move as fast as possible; rely on per-click delay for stability.
-        pyautogui.moveTo(px, py, duration=0)
-        pyautogui.mouseDown(button="left")
-        if opts.mouse_down_s > 0:
-            time.sleep(max(0.0, float(opts.mouse_down_s)))
-        pyautogui.mouseUp(button="left")
-        if per_click_delay > 0:
-            time.sleep(per_click_delay)
+        move_to(px, py)
+        # Same deadline pacing as _tap(): input latency counts toward the delays.
+        up_at = now() + down_s
+        mouse_down()
+        _wait_until(up_at)
+        done_at = now() + per_click_delay
+        mouse_up()
+        _wait_until(done_at)
         if on_point:
             try:
                 on_point(idx)
             except Exception:
                 pass
 
-    if after_stroke_delay > 0:
-        time.sleep(after_stroke_delay)
+    _wait_until(now() + after_stroke_delay)
 
 
 def _interruptible_sleep(duration_s: float, should_stop: Optional[Callable[[], bool]] = None) -> bool:
@@ -239,6 +238,7 @@ def erase_canvas(
         drag_step_duration_s=float(options.drag_step_duration_s),
         after_drag_delay_s=float(options.after_drag_delay_s),
     )
+    cells = _build_cells(canvas_rect, grid_w, grid_h)
 
     # Periodic micro-pauses help avoid the game/UI dropping fast click bursts.
     taps = 0
@@ -274,33 +274,294 @@ def erase_canvas(
         for x in xs:
             if stop():
                 return
-            pt = _cell_center(canvas_rect, grid_w, grid_h, int(x), int(y))
+            pt = _cell_center(cells, int(x), int(y))
             _tap(pt, erase_click_opts)
             taps += 1
             if (taps % burst_pause_every) == 0:
                 _interruptible_sleep(burst_pause_s, should_stop)
 
 
-def _find_best_match(rgb: RGB, cfg: AppConfig) -> Optional[Tuple[MainColor, ShadeButton]]:
-    # Naive: choose closest shade across all colors.
-    # Later: speed up with caching / KD-tree.
-    best = None
-    best_dist = None
+@dataclass
+class _PaletteSoA:
+    """Flattened palette: parallel columns instead of nested MainColor/ShadeButton objects."""
+
+    signature: tuple
+    refs: List[Tuple[MainColor, ShadeButton]]
+    keys: List[Tuple[str, Point]]
+    r: array
+    g: array
+    b: array
+
+
+def _palette_soa(cfg: AppConfig) -> _PaletteSoA:
+    """Flattened palette for cfg, cached on the config object.
+
+    The cache key covers both the palette contents (the UI edits the
+    main_colors list and its shades in place) and the identity of each
+    MainColor/ShadeButton, since a hit hands back the cached objects and
+    _select_shade taps their positions. A color removed and re-added with the
+    same values is a new object, so it forces a rebuild. The cached refs keep
+    the old objects alive, so their ids can't be reused while cached.
+    """
+
+    refs = [(mc, sh) for mc in cfg.main_colors for sh in mc.shades]
+    signature = tuple(
+        (id(mc), id(sh), mc.name, mc.pos, sh.name, sh.pos, sh.rgb) for mc, sh in refs
+    )
+    soa = getattr(cfg, "_palette_cache", None)
+    if soa is not None and soa.signature == signature:
+        return soa
+    soa = _PaletteSoA(
+        signature=signature,
+        refs=refs,
+        keys=[(mc.name, sh.pos) for mc, sh in refs],
+        r=array("B", [int(sh.rgb[0]) for _, sh in refs]),
+        g=array("B", [int(sh.rgb[1]) for _, sh in refs]),
+        b=array("B", [int(sh.rgb[2]) for _, sh in refs]),
+    )
+    # Not a dataclass field, so asdict()/save_config() never see it.
+    cfg._palette_cache = soa  # type: ignore[attr-defined]
+    return soa
+
+
+class _PaletteIndex:
+    """Nearest-shade index over every configured (main, shade) pair.
+
+    Shades are kept sorted by their red channel. A query starts at the
+    query's red value and walks outwards in both directions, stopping each
+    side once the red difference alone exceeds the best distance found so
+    far (a 1-D KD-tree style prune). Ties resolve to the shade that comes
+    first in cfg.main_colors order, same as a plain linear scan.
+
+    lookup_index() adds a 32K-entry LUT on top, quantized to 5 bits per
+    channel and filled lazily. A quantized cube only gets a LUT entry when
+    all 8 of its corners resolve to the same shade; nearest-shade regions are
+    convex, so every RGB inside that cube does too. Cubes straddling a
+    boundary are marked mixed and fall back to an exact lookup with a small
+    bounded cache.
+    """
+
+    _EXACT_CACHE_MAX = 4096
+
+    def __init__(self, cfg: AppConfig):
+        soa = _palette_soa(cfg)
+        self.soa = soa
+        order = sorted(range(len(soa.refs)), key=soa.r.__getitem__)
+        self.refs = soa.refs
+        self.keys = soa.keys
+        self._idx = order
+        self._r = [soa.r[i] for i in order]
+        self._g = [soa.g[i] for i in order]
+        self._b = [soa.b[i] for i in order]
+        self._lut = array("h", [_LUT_UNSET]) * 32768
+        # Cube corners sit on a 33^3 lattice (multiples of 8, up to 256) and are
+        # shared by neighboring cubes, so cache them separately.
+        self._corners = array("h", [_LUT_UNSET]) * (33 * 33 * 33)
+        self._exact: Dict[int, int] = {}
+
+    def nearest_index(self, r: int, g: int, b: int) -> int:
+        """Index into refs of the closest shade, or -1 if the palette is empty."""
+
+        rs, gs, bs, idx = self._r, self._g, self._b, self._idx
+        n = len(rs)
+        best = 1 << 30
+        best_i = -1
+        hi = bisect_left(rs, r)
+        lo = hi - 1
+        while lo >= 0 or hi < n:
+            if hi < n:
+                dr = rs[hi] - r
+                d = dr * dr
+                if d > best:
+                    hi = n
+                else:
+                    dg = gs[hi] - g
+                    db = bs[hi] - b
+                    d += dg * dg + db * db
+                    i = idx[hi]
+                    if d < best or (d == best and i < best_i):
+                        best = d
+                        best_i = i
+                    hi += 1
+            if lo >= 0:
+                dr = r - rs[lo]
+                d = dr * dr
+                if d > best:
+                    lo = -1
+                else:
+                    dg = gs[lo] - g
+                    db = bs[lo] - b
+                    d += dg * dg + db * db
+                    i = idx[lo]
+                    if d < best or (d == best and i < best_i):
+                        best = d
+                        best_i = i
+                    lo -= 1
+        return best_i
+
+    def _corner_index(self, cr: int, cg: int, cb: int) -> int:
+        k = (cr * 33 + cg) * 33 + cb
+        v = self._corners[k]
+        if v == _LUT_UNSET:
+            v = self._corners[k] = self.nearest_index(cr << 3, cg << 3, cb << 3)
+        return v
+
+    def _classify_cube(self, qr: int, qg: int, qb: int) -> int:
+        first = self._corner_index(qr, qg, qb)
+        for dr in (0, 1):
+            for dg in (0, 1):
+                for db in (0, 1):
+                    if self._corner_index(qr + dr, qg + dg, qb + db) != first:
+                        return _LUT_MIXED
+        return first
+
+    def lookup_index(self, r: int, g: int, b: int) -> int:
+        """Same result as nearest_index(), served from the LUT when possible."""
+
+        qr, qg, qb = r >> 3, g >> 3, b >> 3
+        q = (qr << 10) | (qg << 5) | qb
+        v = self._lut[q]
+        if v == _LUT_UNSET:
+            v = self._lut[q] = self._classify_cube(qr, qg, qb)
+        if v != _LUT_MIXED:
+            return v
+
+        key = (r << 16) | (g << 8) | b
+        exact = self._exact
+        i = exact.get(key)
+        if i is None:
+            i = self.nearest_index(r, g, b)
+            if len(exact) >= self._EXACT_CACHE_MAX:
+                # Evict the oldest entry (dicts keep insertion order).
+                exact.pop(next(iter(exact)))
+            exact[key] = i
+        return i
+
+
+def _get_palette_index(cfg: AppConfig) -> _PaletteIndex:
+    """Shared _PaletteIndex for cfg, rebuilt only when the palette contents change.
+
+    Keeping it on the config means the LUT filled in by one paint run is still
+    warm for the next one (resume, re-paint, verify).
+    """
+
+    soa = _palette_soa(cfg)
+    index = getattr(cfg, "_palette_index", None)
+    # _palette_soa returns a new object whenever its key changes (contents or
+    # MainColor/ShadeButton identity), so an identity check is enough here.
+    if index is None or index.soa is not soa:
+        index = _PaletteIndex(cfg)
+        cfg._palette_index = index  # type: ignore[attr-defined]
+    return index
+
+
+def _match_all(
+    get_pixel: Callable[[int, int], RGB],
+    grid_w: int,
+    grid_h: int,
+    palette: _PaletteIndex,
+    skip: Optional[Callable[[int, int], bool]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    pixels: Optional[Sequence[RGB]] = None,
+) -> Optional[List[int]]:
+    """Match the whole grid to palette indices in one pass.
+
+    Returns one palette index per cell (row-major), -1 for skipped cells or an
+    empty palette, or None if should_stop() fired. Lookups go through the
+    palette's quantized LUT, so repeated and nearby colors cost an array index
+    rather than a palette search. If pixels (the row-major grid) is given it is
+    read directly instead of calling get_pixel per cell.
+    """
+
+    # Image rows are mostly runs of one color, so reuse the previous cell's
+    # match while the RGB repeats. On a color change, colors already seen in
+    # this pass come from a dict keyed on the pixel itself; only new colors
+    # hit the LUT.
+    lookup = palette.lookup_index
+    seen: Dict[RGB, int] = {}
+    out: List[int] = []
+    append = out.append
+    for y in range(grid_h):
+        if should_stop and should_stop():
+            return None
+        prev: Optional[RGB] = None
+        prev_i = -1
+        if pixels is not None and skip is None:
+            base = y * grid_w
+            for rgb in pixels[base : base + grid_w]:
+                if rgb != prev:
+                    prev = rgb
+                    prev_i = seen.get(rgb)
+                    if prev_i is None:
+                        prev_i = seen[rgb] = lookup(int(rgb[0]), int(rgb[1]), int(rgb[2]))
+                append(prev_i)
+            continue
+        for x in range(grid_w):
+            if skip is not None and skip(x, y):
+                append(-1)
+                continue
+            rgb = pixels[y * grid_w + x] if pixels is not None else get_pixel(x, y)
+            if rgb != prev:
+                prev = rgb
+                prev_i = seen.get(rgb)
+                if prev_i is None:
+                    prev_i = seen[rgb] = lookup(int(rgb[0]), int(rgb[1]), int(rgb[2]))
+            append(prev_i)
+    return out
+
+
+def _dist2_raw(ar: int, ag: int, ab: int, br: int, bg: int, bb: int) -> int:
+    """Squared RGB distance on loose channels, for scalar loops that already have them unpacked."""
+
+    dr = ar - br
+    dg = ag - bg
+    db = ab - bb
+    return dr * dr + dg * dg + db * db
+
 
-    def dist2(a: RGB, b: RGB) -> int:
-        return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+def _near_mask(frame: ScreenFrame, points: List[Point], rgb: RGB, tol2: int) -> List[bool]:
+    """For each screen point, whether the captured pixel is within tol2 of rgb.
 
-    for mc in cfg.main_colors:
-        for sh in mc.shades:
-            d = dist2(rgb, sh.rgb)
-            if best_dist is None or d < best_dist:
-                best_dist = d
-                best = (mc, sh)
-    return best
+    Compares straight against the frame's raw bytes in one pass so verify
+    loops don't build a tuple and call a distance helper per sample.
+    """
 
+    buf = frame.rgb
+    left = frame.left
+    top = frame.top
+    width = frame.width
+    er, eg, eb = int(rgb[0]), int(rgb[1]), int(rgb[2])
+    out: List[bool] = []
+    append = out.append
+    for cx, cy in points:
+        i = ((cy - top) * width + (cx - left)) * 3
+        dr = buf[i] - er
+        dg = buf[i + 1] - eg
+        db = buf[i + 2] - eb
+        append(dr * dr + dg * dg + db * db <= tol2)
+    return out
+
+
+def _far_indices(frame: ScreenFrame, points: Sequence[Point], expected: Sequence[RGB], tol2: int) -> List[int]:
+    """Indices i where the captured pixel at points[i] is farther than tol2 from expected[i].
+
+    Like _near_mask, but every sample has its own expected color, so a row
+    mixing several shades is checked in a single pass.
+    """
 
-def _dist2(a: RGB, b: RGB) -> int:
-    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+    buf = frame.rgb
+    left = frame.left
+    top = frame.top
+    width = frame.width
+    out: List[int] = []
+    for i, ((cx, cy), (er, eg, eb)) in enumerate(zip(points, expected)):
+        j = ((cy - top) * width + (cx - left)) * 3
+        dr = buf[j] - er
+        dg = buf[j + 1] - eg
+        db = buf[j + 2] - eb
+        if dr * dr + dg * dg + db * db > tol2:
+            out.append(i)
+    return out
 
 
 def _sleep_with_stop(duration_s: float, should_stop: Optional[Callable[[], bool]] = None) -> bool:
@@ -322,6 +583,38 @@ def _sleep_with_stop(duration_s: float, should_stop: Optional[Callable[[], bool]
         time.sleep(min(0.02, max(0.0, end - now)))
 
 
+def _wait_until_color(
+    pos: Point,
+    expected_rgb: RGB,
+    timeout_s: float,
+    tol2: int,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> bool:
+    """Wait up to timeout_s for the screen at pos to show expected_rgb.
+
+    Stands in for a fixed post-row delay: polls one pixel every couple of
+    milliseconds and returns as soon as it matches (immediately if the UI has
+    already caught up), otherwise after the full timeout. Returns False only
+    if should_stop() fired.
+    """
+
+    end = time.perf_counter() + max(0.0, float(timeout_s))
+    er, eg, eb = int(expected_rgb[0]), int(expected_rgb[1]), int(expected_rgb[2])
+    while True:
+        if should_stop and should_stop():
+            return False
+        try:
+            ar, ag, ab = get_screen_pixel_rgb(int(pos[0]), int(pos[1]))
+            if _dist2_raw(ar, ag, ab, er, eg, eb) <= tol2:
+                return True
+        except Exception:
+            pass
+        now = time.perf_counter()
+        if now >= end:
+            return True
+        time.sleep(min(0.002, end - now))
+
+
 def _maybe_emit_verify(
     verify_cb: Optional[Callable[[Optional[Tuple[int, int]]], None]],
     pt: Optional[Tuple[int, int]],
@@ -337,6 +630,25 @@ def _maybe_emit_verify(
             pass
 
 
+def _emit_progress_many(
+    coords: Sequence[Tuple[int, int]],
+    progress_cb: Optional[Callable[[int, int], None]],
+    progress_many_cb: Optional[Callable[[Sequence[Tuple[int, int]]], None]],
+) -> None:
+    """Report a batch of completed cells with one callback when possible.
+
+    Falls back to per-cell progress_cb calls if no batched callback is given.
+    """
+
+    if not coords:
+        return
+    if progress_many_cb is not None:
+        progress_many_cb(coords)
+    elif progress_cb is not None:
+        for x, y in coords:
+            progress_cb(int(x), int(y))
+
+
 def _ui_sanity_check_at(
     pos: Point,
     expected_rgb: RGB,
@@ -349,22 +661,86 @@ def _ui_sanity_check_at(
     """
 
     try:
-        actual = get_screen_pixel_rgb(int(pos[0]), int(pos[1]))
+        ar, ag, ab = get_screen_pixel_rgb(int(pos[0]), int(pos[1]))
     except Exception:
         return False
     tol2 = max(0, int(tol)) ** 2
-    return _dist2(actual, expected_rgb) <= tol2
+    er, eg, eb = expected_rgb
+    return _dist2_raw(ar, ag, ab, er, eg, eb) <= tol2
 
 
-def _cell_center(canvas_rect: Tuple[int, int, int, int], grid_w: int, grid_h: int, x: int, y: int) -> Point:
-    x0, y0, w, h = canvas_rect
+@dataclass(frozen=True)
+class _CellGrid:
+    """Precomputed screen-space cell centers for one canvas layout."""
+
+    canvas_rect: Tuple[int, int, int, int]
+    grid_w: int
+    grid_h: int
+    cxs: Tuple[int, ...]
+    cys: Tuple[int, ...]
+
+
+def _build_cells(canvas_rect: Tuple[int, int, int, int], grid_w: int, grid_h: int) -> _CellGrid:
+    """Cell-center columns/rows for a layout.
+
+    paint_grid() and erase_canvas() build this once per run and pass it down.
+    """
+
+    rect = tuple(canvas_rect)
+    x0, y0, w, h = rect
     cell_w = w / grid_w
     cell_h = h / grid_h
+    return _CellGrid(
+        canvas_rect=rect,  # type: ignore[arg-type]
+        grid_w=grid_w,
+        grid_h=grid_h,
+        cxs=tuple(int(x0 + (x + 0.5) * cell_w) for x in range(grid_w)),
+        cys=tuple(int(y0 + (y + 0.5) * cell_h) for y in range(grid_h)),
+    )
+
+
+def _run_points(cells: _CellGrid, y: int, x_start: int, x_end: int) -> List[Point]:
+    """Screen points for cells x_start..x_end of row y (one horizontal run).
+
+    Zips a slice of the precomputed column centers against the row's center,
+    so no per-cell Python code runs.
+    """
+
+    xs = cells.cxs[x_start : x_end + 1]
+    return list(zip(xs, repeat(cells.cys[y], len(xs))))
+
+
+def _cell_center(cells: _CellGrid, x: int, y: int) -> Point:
+    if 0 <= x < cells.grid_w and 0 <= y < cells.grid_h:
+        return (cells.cxs[x], cells.cys[y])
+    x0, y0, w, h = cells.canvas_rect
+    cell_w = w / cells.grid_w
+    cell_h = h / cells.grid_h
     cx = int(x0 + (x + 0.5) * cell_w)
     cy = int(y0 + (y + 0.5) * cell_h)
     return (cx, cy)
 
 
+def _grab_canvas(canvas_rect: Tuple[int, int, int, int]) -> ScreenFrame:
+    """Capture the whole canvas once so verify passes can sample it locally."""
+    x0, y0, w, h = canvas_rect
+    return grab_screen_rect(int(x0), int(y0), int(w), int(h))
+
+
+def _canvas_near_mask(canvas_rect: Tuple[int, int, int, int], points: List[Point], rgb: RGB, tol2: int) -> List[bool]:
+    """_near_mask over one canvas grab, sampling pixel by pixel if the grab fails."""
+    try:
+        frame = _grab_canvas(canvas_rect)
+    except Exception:
+        er, eg, eb = int(rgb[0]), int(rgb[1]), int(rgb[2])
+        out: List[bool] = []
+        for cx, cy in points:
+            ar, ag, ab = get_screen_pixel_rgb(cx, cy)
+            out.append(_dist2_raw(ar, ag, ab, er, eg, eb) <= tol2)
+        return out
+    return _near_mask(frame, points, rgb, tol2)
+
+
 def _select_shade(
     cfg: AppConfig,
     options: PainterOptions,
@@ -471,11 +847,50 @@ def _bucket_fill_canvas_with_shade(
         time.sleep(settle_s)
 
 
+def _coord_runs(coords: List[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+    """Split (y, x)-sorted coords into maximal runs of horizontally adjacent cells."""
+
+    n = len(coords)
+    if n == 0:
+        return []
+    bounds = [0]
+    bounds.extend(
+        i
+        for i in range(1, n)
+        if coords[i][1] != coords[i - 1][1] or coords[i][0] != coords[i - 1][0] + 1
+    )
+    bounds.append(n)
+    return [coords[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+def _snake_runs(runs: List[List[Tuple[int, int]]]) -> List[List[Tuple[int, int]]]:
+    """Reorder row-major runs so every other row touched is walked right to left.
+
+    Each row then starts near where the previous one ended, instead of the
+    pointer sweeping back across the canvas. Flipped runs are reversed too.
+    """
+
+    out: List[List[Tuple[int, int]]] = []
+    flip = False
+    i = 0
+    n = len(runs)
+    while i < n:
+        y = runs[i][0][1]
+        j = i + 1
+        while j < n and runs[j][0][1] == y:
+            j += 1
+        if flip:
+            out.extend(run[::-1] for run in reversed(runs[i:j]))
+        else:
+            out.extend(runs[i:j])
+        flip = not flip
+        i = j
+    return out
+
+
 def _paint_coord_runs(
     cfg: AppConfig,
-    canvas_rect: Tuple[int, int, int, int],
-    grid_w: int,
-    grid_h: int,
+    cells: _CellGrid,
     coords: List[Tuple[int, int]],
     options: PainterOptions,
     progress_cb: Optional[Callable[[int, int], None]] = None,
@@ -486,30 +901,17 @@ def _paint_coord_runs(
     if not coords:
         return
 
-    x0, y0, w, h = canvas_rect
-    cell_w = w / grid_w
-    cell_h = h / grid_h
-
     coords.sort(key=lambda xy: (xy[1], xy[0]))
-    i = 0
-    while i < len(coords):
+    for run in _snake_runs(_coord_runs(coords)):
         if should_stop and should_stop():
             return
-        x, y = coords[i]
-        run = [(x, y)]
-        j = i + 1
-        while j < len(coords):
-            nx, ny = coords[j]
-            if ny != y or nx != run[-1][0] + 1:
-                break
-            run.append((nx, ny))
-            j += 1
 
-        pts: List[Point] = []
-        for rx, ry in run:
-            cx = int(x0 + (rx + 0.5) * cell_w)
-            cy = int(y0 + (ry + 0.5) * cell_h)
-            pts.append((cx, cy))
+        xa, xb = run[0][0], run[-1][0]
+        if xa <= xb:
+            pts = _run_points(cells, run[0][1], xa, xb)
+        else:
+            pts = _run_points(cells, run[0][1], xb, xa)
+            pts.reverse()
 
         if options.enable_drag_strokes and len(pts) >= 2:
             if progress_cb:
@@ -523,15 +925,15 @@ def _paint_coord_runs(
                 _rapid_click_stroke(pts, options, should_stop=should_stop, on_point=_on_point)
             else:
                 _rapid_click_stroke(pts, options, should_stop=should_stop)
-        else:
-            for (rx, ry), p in zip(run, pts):
-                if should_stop and should_stop():
-                    return
-                _tap(p, options)
-                if progress_cb:
-                    progress_cb(int(rx), int(ry))
+        elif progress_cb:
+            def _on_tap(idx: int) -> None:
+                rx, ry = run[idx]
+                progress_cb(int(rx), int(ry))
 
-        i = j
+            if not _tap_many(pts, options, should_stop=should_stop, on_point=_on_tap):
+                return
+        elif not _tap_many(pts, options, should_stop=should_stop):
+            return
 
 
 def _verify_outline_then_repair(
@@ -539,6 +941,7 @@ def _verify_outline_then_repair(
     canvas_rect: Tuple[int, int, int, int],
     grid_w: int,
     grid_h: int,
+    cells: _CellGrid,
     outline_coords: List[Tuple[int, int]],
     expected_rgb: Optional[RGB],
     avoid_rgb: Optional[RGB],
@@ -587,24 +990,19 @@ def _verify_outline_then_repair(
             except Exception:
                 pass
 
-        mism: List[Tuple[int, int]] = []
-        for i, (x, y) in enumerate(coords):
-            if should_stop and should_stop():
-                return False
-            cx, cy = _cell_center(canvas_rect, grid_w, grid_h, x, y)
-            _maybe_emit_verify(verify_cb, (x, y), i, every=8)
-            actual = get_screen_pixel_rgb(cx, cy)
-
-            if avoid_rgb is not None:
-                # Mismatch if the outline pixel still looks like base fill.
-                if _dist2(actual, avoid_rgb) <= tol2:
-                    mism.append((x, y))
-            else:
-                # Fallback: mismatch if pixel doesn't match expected.
-                if expected_rgb is None:
-                    continue
-                if _dist2(actual, expected_rgb) > tol2:
-                    mism.append((x, y))
+        if should_stop and should_stop():
+            return False
+        pts = [(cells.cxs[x], cells.cys[y]) for x, y in coords]
+        _maybe_emit_verify(verify_cb, coords[0], 0, every=1)
+
+        if avoid_rgb is not None:
+            # Mismatch if the outline pixel still looks like base fill.
+            near = _canvas_near_mask(canvas_rect, pts, avoid_rgb, tol2)
+            mism = [xy for xy, n in zip(coords, near) if n]
+        else:
+            # Fallback: mismatch if pixel doesn't match expected.
+            near = _canvas_near_mask(canvas_rect, pts, expected_rgb, tol2)
+            mism = [xy for xy, n in zip(coords, near) if not n]
 
         if not mism:
             _maybe_emit_verify(verify_cb, None, 0, every=1)
@@ -613,9 +1011,7 @@ def _verify_outline_then_repair(
         # Repaint just the mismatched outline pixels.
         _paint_coord_runs(
             cfg=cfg,
-            canvas_rect=canvas_rect,
-            grid_w=grid_w,
-            grid_h=grid_h,
+            cells=cells,
             coords=mism,
             options=options,
             progress_cb=None,
@@ -626,19 +1022,97 @@ def _verify_outline_then_repair(
     return False
 
 
+def _grab_row(cells: _CellGrid, y: int) -> Optional[ScreenFrame]:
+    """Capture the 1px strip through row y's cell centers, or None if the grab fails."""
+
+    x0, _y0, w, _h = cells.canvas_rect
+    cy = cells.cys[y]
+    try:
+        return grab_screen_rect(int(x0), cy, int(w), 1)
+    except Exception:
+        return None
+
+
+def _row_cell_mismatches(
+    frame: Optional[ScreenFrame],
+    cells: _CellGrid,
+    y: int,
+    xs: Sequence[int],
+    rgb: RGB,
+    tol2: int,
+) -> List[int]:
+    """Return the xs in row y whose cell doesn't match rgb.
+
+    Samples frame (from _grab_row); falls back to per-pixel reads if it's None.
+    """
+
+    cy = cells.cys[y]
+    pts = [(cells.cxs[x], cy) for x in xs]
+    if frame is None:
+        er, eg, eb = rgb
+        bad: List[int] = []
+        for x, (cx, cy) in zip(xs, pts):
+            ar, ag, ab = get_screen_pixel_rgb(cx, cy)
+            if _dist2_raw(ar, ag, ab, er, eg, eb) > tol2:
+                bad.append(x)
+        return bad
+    return [x for x, ok in zip(xs, _near_mask(frame, pts, rgb, tol2)) if not ok]
+
+
+def _row_mismatches(
+    cells: _CellGrid,
+    y: int,
+    row_runs: List[Tuple[int, int, MainColor, ShadeButton]],
+    tol2: int,
+) -> List[int]:
+    """Return the x of every run cell in row y that doesn't match its shade.
+
+    The whole row strip is captured with a single grab.
+    """
+
+    grid_w = cells.grid_w
+    frame = _grab_row(cells, y)
+    if frame is None:
+        bad: List[int] = []
+        for x_start, x_end, _main, shade in row_runs:
+            xs = range(x_start, min(x_end, grid_w - 1) + 1)
+            bad.extend(_row_cell_mismatches(None, cells, y, xs, shade.rgb, tol2))
+        return bad
+
+    # Flatten the runs into per-cell (x, expected) and compare the whole row at once.
+    xs_all: List[int] = []
+    expected: List[RGB] = []
+    pts: List[Point] = []
+    for x_start, x_end, _main, shade in row_runs:
+        xs = range(x_start, min(x_end, grid_w - 1) + 1)
+        xs_all.extend(xs)
+        expected.extend([shade.rgb] * len(xs))
+        pts.extend(_run_points(cells, y, x_start, min(x_end, grid_w - 1)))
+    return [xs_all[i] for i in _far_indices(frame, pts, expected, tol2)]
+
+
 def _verify_and_repair_row(
     cfg: AppConfig,
-    canvas_rect: Tuple[int, int, int, int],
     grid_w: int,
     grid_h: int,
+    cells: _CellGrid,
     y: int,
-    row_expected: List[Optional[Tuple[MainColor, ShadeButton]]],
+    row_runs: List[Tuple[int, int, MainColor, ShadeButton]],
     options: PainterOptions,
     progress_cb: Optional[Callable[[int, int], None]] = None,
     should_stop: Optional[Callable[[], bool]] = None,
     status_cb: Optional[Callable[[str], None]] = None,
     verify_cb: Optional[Callable[[Optional[Tuple[int, int]]], None]] = None,
+    initial_mismatches: Optional[List[int]] = None,
 ) -> None:
+    """Verify one painted row and repaint mismatched cells until it converges.
+
+    row_runs are (x_start, x_end, main, shade), left to right and disjoint.
+    initial_mismatches, if given, is a scan the caller already took after
+    settling (see _row_mismatches); the first pass reuses it instead of
+    sampling the row again.
+    """
+
     if not bool(getattr(cfg, "verify_rows", True)):
         _maybe_emit_verify(verify_cb, None, 0, every=1)
         return
@@ -654,35 +1128,44 @@ def _verify_and_repair_row(
     for _pass in range(max_passes):
         if should_stop and should_stop():
             return
-        if settle_s > 0:
-            if not _sleep_with_stop(settle_s, should_stop=should_stop):
-                return
 
-        if status_cb is not None:
-            try:
-                status_cb(f"Verifying row {y+1}/{grid_h}… pass {_pass+1}/{max_passes}")
-            except Exception:
-                pass
+        if _pass == 0 and initial_mismatches is not None:
+            prescanned = initial_mismatches
+        else:
+            if settle_s > 0:
+                if not _sleep_with_stop(settle_s, should_stop=should_stop):
+                    return
 
-        # Collect mismatches grouped by shade
-        groups: Dict[Tuple[str, Point], Tuple[MainColor, ShadeButton, List[int]]] = {}
-        for x in range(grid_w):
-            if should_stop and should_stop():
-                return
-            exp = row_expected[x] if x < len(row_expected) else None
-            if exp is None:
-                continue
-            main, shade = exp
+            if status_cb is not None:
+                try:
+                    status_cb(f"Verifying row {y+1}/{grid_h}… pass {_pass+1}/{max_passes}")
+                except Exception:
+                    pass
+            if row_runs:
+                _maybe_emit_verify(verify_cb, (row_runs[0][0], y), 0, every=1)
+            prescanned = _row_mismatches(cells, y, row_runs, tol2)
 
-            cx, cy = _cell_center(canvas_rect, grid_w, grid_h, x, y)
-            _maybe_emit_verify(verify_cb, (x, y), x, every=6)
-            actual = get_screen_pixel_rgb(cx, cy)
-            if _dist2(actual, shade.rgb) <= tol2:
+        # Group mismatches by shade. _row_mismatches returns each run cell at
+        # most once, left to right; cells not covered by a run (skipped /
+        # unmatched) are never sampled.
+        groups: Dict[Tuple[str, Point], Tuple[MainColor, ShadeButton, List[int]]] = {}
+        r = 0
+        n_runs = len(row_runs)
+        for x in prescanned:
+            # Runs are left to right too, so find each cell's run by walking
+            # them alongside the mismatches.
+            while r < n_runs and min(row_runs[r][1], grid_w - 1) < x:
+                r += 1
+            if r == n_runs:
+                break
+            x_start, _x_end, main, shade = row_runs[r]
+            if x < x_start:
                 continue
             key = (main.name, shade.pos)
-            if key not in groups:
-                groups[key] = (main, shade, [])
-            groups[key][2].append(x)
+            g = groups.get(key)
+            if g is None:
+                g = groups[key] = (main, shade, [])
+            g[2].append(x)
 
         if not groups:
             _maybe_emit_verify(verify_cb, None, 0, every=1)
@@ -735,36 +1218,15 @@ def _verify_and_repair_row(
 
             xs.sort()
             # Break into contiguous runs so we can use the fast stroke option.
-            run: List[int] = []
-            for x in xs:
-                if not run or x == run[-1] + 1:
-                    run.append(x)
-                    continue
-                pts = [_cell_center(canvas_rect, grid_w, grid_h, rx, y) for rx in run]
+            for run in _coord_runs([(x, y) for x in xs]):
+                pts = _run_points(cells, y, run[0][0], run[-1][0])
                 if options.enable_drag_strokes and len(pts) >= 2:
                     _rapid_click_stroke(pts, options, should_stop=should_stop)
-                else:
-                    for p in pts:
-                        if should_stop and should_stop():
-                            return
-                        _tap(p, options)
-                if progress_cb:
-                    for rx in run:
-                        progress_cb(rx, y)
-                run = [x]
-
-            if run:
-                pts = [_cell_center(canvas_rect, grid_w, grid_h, rx, y) for rx in run]
-                if options.enable_drag_strokes and len(pts) >= 2:
-                    _rapid_click_stroke(pts, options, should_stop=should_stop)
-                else:
-                    for p in pts:
-                        if should_stop and should_stop():
-                            return
-                        _tap(p, options)
+                elif not _tap_many(pts, options, should_stop=should_stop):
+                    return
                 if progress_cb:
-                    for rx in run:
-                        progress_cb(rx, y)
+                    for rx, ry in run:
+                        progress_cb(rx, ry)
 
         if in_shades_panel:
             _tap(cfg.back_button_pos, options)
@@ -793,9 +1255,7 @@ def _verify_and_repair_row(
 
 def _verify_and_repair_color_group(
     cfg: AppConfig,
-    canvas_rect: Tuple[int, int, int, int],
-    grid_w: int,
-    grid_h: int,
+    cells: _CellGrid,
     main: MainColor,
     shade: ShadeButton,
     coords: List[Tuple[int, int]],
@@ -804,15 +1264,22 @@ def _verify_and_repair_color_group(
     should_stop: Optional[Callable[[], bool]] = None,
     status_cb: Optional[Callable[[str], None]] = None,
     verify_cb: Optional[Callable[[Optional[Tuple[int, int]]], None]] = None,
-) -> None:
+    last_main: Optional[MainColor] = None,
+    last_shade: Optional[ShadeButton] = None,
+    in_shades_panel: bool = False,
+) -> Tuple[Optional[MainColor], Optional[ShadeButton], bool]:
     """Verify/repaint a single shade group after painting it.
 
     This is used by Paint-by-Color to keep the initial pass fast and then
     correct any missed pixels per color.
+
+    last_main/last_shade/in_shades_panel are the caller's palette selection
+    state; the state the UI is left in (after any reselects or a recovery
+    back tap) is returned so the caller stays in sync.
     """
 
     if not bool(getattr(cfg, "verify_rows", True)):
-        return
+        return last_main, last_shade, in_shades_panel
 
     tol = int(getattr(cfg, "verify_tolerance", 35))
     tol2 = max(0, tol) ** 2
@@ -820,13 +1287,21 @@ def _verify_and_repair_color_group(
     settle_s = max(0.0, float(getattr(cfg, "verify_settle_s", 0.05)))
 
     coords_sorted = sorted(coords, key=lambda xy: (xy[1], xy[0]))
+    if not coords_sorted:
+        return last_main, last_shade, in_shades_panel
+    pts = [(cells.cxs[x], cells.cys[y]) for x, y in coords_sorted]
+    # Bounding box of the group's cell centers; each pass grabs just this once.
+    bx0 = min(cells.cxs[x] for x, _y in coords_sorted)
+    bx1 = max(cells.cxs[x] for x, _y in coords_sorted)
+    by0 = pts[0][1]
+    by1 = pts[-1][1]
 
     for _pass in range(max_passes):
         if should_stop and should_stop():
-            return
+            return last_main, last_shade, in_shades_panel
         if settle_s > 0:
             if not _sleep_with_stop(settle_s, should_stop=should_stop):
-                return
+                return last_main, last_shade, in_shades_panel
 
         if status_cb is not None:
             try:
@@ -836,24 +1311,40 @@ def _verify_and_repair_color_group(
             except Exception:
                 pass
 
+        _maybe_emit_verify(verify_cb, coords_sorted[0], 0, every=1)
+        try:
+            frame: Optional[ScreenFrame] = grab_screen_rect(bx0, by0, bx1 - bx0 + 1, by1 - by0 + 1)
+        except Exception:
+            frame = None
         mismatches: List[Tuple[int, int]] = []
-        for i, (x, y) in enumerate(coords_sorted):
+        if frame is not None:
+            near = _near_mask(frame, pts, shade.rgb, tol2)
+            mismatches = [xy for xy, ok in zip(coords_sorted, near) if not ok]
+
+        # If the box grab failed, fall back to one strip grab per grid row.
+        i = 0
+        n = len(coords_sorted) if frame is None else 0
+        while i < n:
             if should_stop and should_stop():
-                return
-            cx, cy = _cell_center(canvas_rect, grid_w, grid_h, x, y)
-            _maybe_emit_verify(verify_cb, (x, y), i, every=10)
-            actual = get_screen_pixel_rgb(cx, cy)
-            if _dist2(actual, shade.rgb) > tol2:
-                mismatches.append((x, y))
+                return last_main, last_shade, in_shades_panel
+            y = coords_sorted[i][1]
+            j = i
+            while j < n and coords_sorted[j][1] == y:
+                j += 1
+            xs = [x for x, _y in coords_sorted[i:j]]
+            _maybe_emit_verify(verify_cb, (xs[0], y), 0, every=1)
+            frame = _grab_row(cells, y)
+            mismatches.extend((x, y) for x in _row_cell_mismatches(frame, cells, y, xs, shade.rgb, tol2))
+            i = j
 
         if not mismatches:
             _maybe_emit_verify(verify_cb, None, 0, every=1)
-            return
+            return last_main, last_shade, in_shades_panel
 
         # Force a full reselect each pass; if a click failed earlier, relying on
         # cached state can keep repainting with the wrong shade.
-        last_main: Optional[MainColor] = None
-        last_shade: Optional[ShadeButton] = None
+        last_main = None
+        last_shade = None
         in_shades_panel = False
 
         last_main, last_shade, in_shades_panel = _select_shade(
@@ -868,35 +1359,20 @@ def _verify_and_repair_color_group(
 
         # Repaint mismatches, using contiguous horizontal runs for speed.
         mismatches.sort(key=lambda xy: (xy[1], xy[0]))
-        i = 0
-        while i < len(mismatches):
+        for run in _coord_runs(mismatches):
             if should_stop and should_stop():
-                return
-            x, y = mismatches[i]
-            run = [(x, y)]
-            j = i + 1
-            while j < len(mismatches):
-                nx, ny = mismatches[j]
-                if ny != y or nx != run[-1][0] + 1:
-                    break
-                run.append((nx, ny))
-                j += 1
+                return last_main, last_shade, in_shades_panel
 
-            pts = [_cell_center(canvas_rect, grid_w, grid_h, rx, ry) for rx, ry in run]
-            if options.enable_drag_strokes and len(pts) >= 2:
-                _rapid_click_stroke(pts, options, should_stop=should_stop)
-            else:
-                for p in pts:
-                    if should_stop and should_stop():
-                        return
-                    _tap(p, options)
+            run_pts = _run_points(cells, run[0][1], run[0][0], run[-1][0])
+            if options.enable_drag_strokes and len(run_pts) >= 2:
+                _rapid_click_stroke(run_pts, options, should_stop=should_stop)
+            elif not _tap_many(run_pts, options, should_stop=should_stop):
+                return last_main, last_shade, in_shades_panel
 
             if progress_cb:
                 for rx, ry in run:
                     progress_cb(rx, ry)
 
-            i = j
-
     if bool(getattr(cfg, "verify_auto_recover_loops", False)):
         if status_cb is not None:
             try:
@@ -908,7 +1384,7 @@ def _verify_and_repair_color_group(
             _tap(cfg.back_button_pos, options)
         except Exception:
             pass
-        return
+        return None, None, False
 
     raise RuntimeError(
         "Color verification failed for a shade group. "
@@ -916,6 +1392,188 @@ def _verify_and_repair_color_group(
     )
 
 
+def _find_uniform_rects(
+    cell_ids: List[int],
+    grid_w: int,
+    grid_h: int,
+    min_area: int,
+) -> List[Tuple[int, int, int, int, int]]:
+    """Quadtree-split the grid into large uniform axis-aligned rectangles.
+
+    cell_ids holds one shade id per cell (row-major); negative ids never match.
+    Returns (x, y, w, h, id) for every uniform node of at least min_area cells,
+    in row-major order of their top-left corners.
+    """
+
+    min_area = max(1, int(min_area))
+    out: List[Tuple[int, int, int, int, int]] = []
+    stack = [(0, 0, grid_w, grid_h)]
+    while stack:
+        x, y, w, h = stack.pop()
+        if w <= 0 or h <= 0 or w * h < min_area:
+            continue
+
+        first = cell_ids[y * grid_w + x]
+        uniform = first >= 0
+        if uniform:
+            for yy in range(y, y + h):
+                i = yy * grid_w + x
+                if cell_ids[i : i + w].count(first) != w:
+                    uniform = False
+                    break
+        if uniform:
+            out.append((x, y, w, h, first))
+            continue
+
+        hw = w // 2
+        hh = h // 2
+        if hw > 0 and hh > 0:
+            stack.extend(
+                (
+                    (x, y, hw, hh),
+                    (x + hw, y, w - hw, hh),
+                    (x, y + hh, hw, h - hh),
+                    (x + hw, y + hh, w - hw, h - hh),
+                )
+            )
+        elif hw > 0:
+            stack.extend(((x, y, hw, h), (x + hw, y, w - hw, h)))
+        elif hh > 0:
+            stack.extend(((x, y, w, hh), (x, y + hh, w, h - hh)))
+
+    out.sort(key=lambda r: (r[1], r[0]))
+    return out
+
+
+def _bucket_fill_uniform_rects(
+    cfg: AppConfig,
+    canvas_rect: Tuple[int, int, int, int],
+    grid_w: int,
+    grid_h: int,
+    cells: _CellGrid,
+    cell_matches: List[Optional[Tuple[MainColor, ShadeButton]]],
+    base_key: Tuple[str, Point],
+    min_area: int,
+    options: PainterOptions,
+    should_stop: Optional[Callable[[], bool]] = None,
+    status_cb: Optional[Callable[[str], None]] = None,
+    verify_cb: Optional[Callable[[Optional[Tuple[int, int]]], None]] = None,
+) -> set[int]:
+    """Outline + bucket-fill large uniform rectangles on top of a base fill.
+
+    Used by Paint-by-Row, which has no connected-region pass of its own.
+    Rectangles come from _find_uniform_rects(); each one is outlined with the
+    paint tool, the outline is verified against the rectangle's shade, and then
+    the inside is bucket-filled. Returns packed ids (y * grid_w + x) of filled
+    cells; the caller still verifies them row by row.
+    """
+
+    if cfg.paint_tool_button_pos is None or cfg.bucket_tool_button_pos is None:
+        return set()
+
+    # Map each cell to a small shade id so the quadtree can compare ints.
+    key_ids: Dict[Tuple[str, Point], int] = {}
+    refs: List[Tuple[MainColor, ShadeButton]] = []
+    cell_ids: List[int] = []
+    for m in cell_matches:
+        if m is None:
+            cell_ids.append(-1)
+            continue
+        k = (m[0].name, m[1].pos)
+        sid = key_ids.get(k)
+        if sid is None:
+            sid = key_ids[k] = len(refs)
+            refs.append(m)
+        cell_ids.append(sid)
+
+    base_id = key_ids.get(base_key, -1)
+    rects = [
+        r
+        for r in _find_uniform_rects(cell_ids, grid_w, grid_h, min_area)
+        # The base shade is already there, and a fill only pays off when the inside
+        # is larger than the outline we have to paint first.
+        if r[4] != base_id and (r[2] - 2) * (r[3] - 2) > 2 * (r[2] + r[3]) - 4
+    ]
+    if not rects:
+        return set()
+
+    tol2 = max(0, int(getattr(cfg, "verify_tolerance", 35))) ** 2
+    settle_s = max(0.0, float(getattr(cfg, "verify_settle_s", 0.05)))
+
+    filled: set[int] = set()
+    for n, (rx, ry, rw, rh, sid) in enumerate(rects):
+        if should_stop and should_stop():
+            break
+        main, shade = refs[sid]
+        if status_cb is not None:
+            try:
+                status_cb(f"Rect fill {n+1}/{len(rects)}: {main.name}/{shade.name} {rw}x{rh}…")
+            except Exception:
+                pass
+
+        _, _, in_shades_panel = _select_shade(cfg, options, main, shade, None, None, False)
+        _tap(cfg.paint_tool_button_pos, options)
+
+        right = rx + rw - 1
+        bottom = ry + rh - 1
+        outline = [(x, ry) for x in range(rx, right + 1)]
+        outline += [(x, bottom) for x in range(rx, right + 1)]
+        outline += [(rx, y) for y in range(ry + 1, bottom)]
+        outline += [(right, y) for y in range(ry + 1, bottom)]
+        _paint_coord_runs(
+            cfg=cfg,
+            cells=cells,
+            coords=list(outline),
+            options=options,
+            progress_cb=None,
+            should_stop=should_stop,
+        )
+
+        sealed = _verify_outline_then_repair(
+            cfg=cfg,
+            canvas_rect=canvas_rect,
+            grid_w=grid_w,
+            grid_h=grid_h,
+            cells=cells,
+            outline_coords=outline,
+            # Check for the rect's own shade, not just "not base": if the shade
+            # tap didn't register, the outline is in the previous shade.
+            expected_rgb=shade.rgb,
+            avoid_rgb=None,
+            options=options,
+            should_stop=should_stop,
+            status_cb=status_cb,
+            verify_cb=verify_cb,
+        )
+        if sealed and not (should_stop and should_stop()):
+            fx = rx + rw // 2
+            fy = ry + rh // 2
+            _tap(cfg.bucket_tool_button_pos, options)
+            _tap(_cell_center(cells, fx, fy), options)
+            _tap(cfg.paint_tool_button_pos, options)
+            if settle_s > 0 and not _sleep_with_stop(settle_s, should_stop=should_stop):
+                break
+            seed = [_cell_center(cells, fx, fy)]
+            try:
+                seed_ok = _canvas_near_mask(canvas_rect, seed, shade.rgb, tol2)[0]
+            except Exception:
+                # Couldn't sample; leave the rect to the row pass.
+                seed_ok = False
+            if seed_ok:
+                for yy in range(ry, ry + rh):
+                    filled.update(range(yy * grid_w + rx, yy * grid_w + rx + rw))
+        elif status_cb is not None:
+            try:
+                status_cb("Rect fill skipped (outline didn't verify)")
+            except Exception:
+                pass
+
+        if in_shades_panel:
+            _tap(cfg.back_button_pos, options)
+
+    return filled
+
+
 def paint_grid(
     cfg: AppConfig,
     canvas_rect: Tuple[int, int, int, int],
@@ -934,17 +1592,31 @@ def paint_grid(
     should_stop: Optional[Callable[[], bool]] = None,
     status_cb: Optional[Callable[[str], None]] = None,
     verify_cb: Optional[Callable[[Optional[Tuple[int, int]]], None]] = None,
+    progress_many_cb: Optional[Callable[[Sequence[Tuple[int, int]]], None]] = None,
+    get_pixels: Optional[Callable[[], Sequence[RGB]]] = None,
 ) -> None:
     """Paints a WxH pixel grid into a canvas rectangle.
 
     This assumes the game's canvas pixels map evenly into the selected rectangle.
     The actual mapping may need per-game tweaking; this is the first-pass.
+
+    progress_many_cb, if given, receives batches of completed cells (whole
+    strokes, bucket-filled regions) in place of one progress_cb call per cell.
+
+    get_pixels, if given, returns the whole grid as a row-major RGB sequence
+    (e.g. PixelGrid.pixels); it is read once instead of calling get_pixel
+    per cell. get_pixel is still used if the sequence has the wrong length.
     """
 
     if options is None:
         options = PainterOptions()
 
-    x0, y0, w, h = canvas_rect
+    pixels: Optional[Sequence[RGB]] = None
+    if get_pixels is not None:
+        pixels = get_pixels()
+        if pixels is not None and len(pixels) != grid_w * grid_h:
+            pixels = None
+
     if grid_w <= 0 or grid_h <= 0:
         return
 
@@ -952,11 +1624,7 @@ def paint_grid(
         raise RuntimeError("Color configuration incomplete. Set up colors and global buttons first.")
 
     # Compute cell centers
-    cell_w = w / grid_w
-    cell_h = h / grid_h
-
-    pyautogui.PAUSE = 0
-    pyautogui.FAILSAFE = True  # moving mouse to top-left aborts
+    cells = _build_cells(canvas_rect, grid_w, grid_h)
 
     mode = (paint_mode or "row").strip().lower()
     if mode in {"color", "colour", "paint by color"}:
@@ -970,6 +1638,7 @@ def paint_grid(
             canvas_rect=canvas_rect,
             grid_w=grid_w,
             grid_h=grid_h,
+            cells=cells,
             get_pixel=get_pixel,
             options=options,
             skip=skip,
@@ -982,6 +1651,8 @@ def paint_grid(
             should_stop=should_stop,
             status_cb=status_cb,
             verify_cb=verify_cb,
+            progress_many_cb=progress_many_cb,
+            pixels=pixels,
         )
         return
 
@@ -994,8 +1665,11 @@ def paint_grid(
     lag = max(0, int(getattr(cfg, "verify_streaming_lag", 10)))
     # Clamp lag to something sensible so it doesn't appear "stuck".
     lag = min(lag, 200)
+    verify_rows = bool(getattr(cfg, "verify_rows", True))
     verify_tol = int(getattr(cfg, "verify_tolerance", 35))
     verify_tol2 = max(0, verify_tol) ** 2
+    verify_settle_s = max(0.0, float(getattr(cfg, "verify_settle_s", 0.05)))
+    verify_max_passes = max(1, int(getattr(cfg, "verify_max_passes", 10)))
     verify_queue = deque()  # (x, y, main, shade)
     verify_i = 0
 
@@ -1003,19 +1677,31 @@ def paint_grid(
         nonlocal last_main, last_shade, in_shades_panel, verify_i
         if not streaming:
             return
-        while verify_queue and (force or len(verify_queue) > lag):
+        n = len(verify_queue) if force else len(verify_queue) - lag
+        if n <= 0:
+            return
+        if should_stop and should_stop():
+            return
+        # Everything due is sampled with one grab around those cells rather
+        # than a 1x1 grab per cell.
+        batch = [verify_queue.popleft() for _ in range(n)]
+        pts = [_cell_center(cells, int(x), int(y)) for x, y, _m, _s in batch]
+        try:
+            samples: Optional[List[RGB]] = get_screen_pixels_rgb(pts)
+        except Exception:
+            samples = None
+        for i, (x, y, main, shade) in enumerate(batch):
             if should_stop and should_stop():
                 return
-            x, y, main, shade = verify_queue.popleft()
-            cx, cy = _cell_center(canvas_rect, grid_w, grid_h, int(x), int(y))
+            cx, cy = pts[i]
             verify_i += 1
             # Always update the cursor so streaming verify is visible.
             _maybe_emit_verify(verify_cb, (int(x), int(y)), verify_i, every=1)
-            try:
-                actual = get_screen_pixel_rgb(cx, cy)
-            except Exception:
+            if samples is None:
                 continue
-            if _dist2(actual, shade.rgb) <= verify_tol2:
+            ar, ag, ab = samples[i]
+            er, eg, eb = shade.rgb
+            if _dist2_raw(ar, ag, ab, er, eg, eb) <= verify_tol2:
                 continue
 
             # Mismatch: select the expected shade and repaint this cell.
@@ -1034,36 +1720,37 @@ def paint_grid(
 
         _maybe_emit_verify(verify_cb, None, 0, every=1)
 
-    # Cache best-match results for repeated RGBs.
-    match_cache: Dict[RGB, Optional[Tuple[MainColor, ShadeButton]]] = {}
-
-    def get_match(rgb: RGB) -> Optional[Tuple[MainColor, ShadeButton]]:
-        if rgb in match_cache:
-            return match_cache[rgb]
-        m = _find_best_match(rgb, cfg)
-        match_cache[rgb] = m
-        return m
+    # Match the whole grid up front. Shades that share a (main, shade-pos) key
+    # are the same button, so fold them onto one id; rows are then planned as
+    # runs of equal ids.
+    palette = _get_palette_index(cfg)
+    refs = palette.refs
+    if not refs:
+        return
+    cell_idx = _match_all(get_pixel, grid_w, grid_h, palette, skip=skip, should_stop=should_stop, pixels=pixels)
+    if cell_idx is None:
+        return
+    first_of_key: Dict[Tuple[str, Point], int] = {}
+    canon = [first_of_key.setdefault(key, k) for k, key in enumerate(palette.keys)]
+    cell_ids = [canon[k] if k >= 0 else -1 for k in cell_idx]
 
     # Optional bucket-fill pre-pass: fill the entire canvas with the most-used shade,
     # then skip painting that shade in the per-pixel pass.
     bucket_key: Optional[Tuple[str, Point]] = None
     if allow_bucket_fill and bool(getattr(cfg, "bucket_fill_enabled", False)):
-        # Build usage counts.
+        # Build usage counts from the palette indices. Counter keeps first-seen
+        # order, so ties still go to the earliest shade.
         counts: Dict[Tuple[str, Point], Tuple[int, MainColor, ShadeButton]] = {}
-        for yy in range(grid_h):
-            for xx in range(grid_w):
-                if should_stop and should_stop():
-                    return
-                if skip is not None and skip(xx, yy):
-                    continue
-                m = get_match(get_pixel(xx, yy))
-                if m is None:
-                    continue
-                mc, sh = m
-                k = (mc.name, sh.pos)
-                if k not in counts:
-                    counts[k] = (0, mc, sh)
-                counts[k] = (counts[k][0] + 1, counts[k][1], counts[k][2])
+        for k, n in Counter(cell_idx).items():
+            if k < 0:
+                continue
+            key = palette.keys[k]
+            prev = counts.get(key)
+            if prev is None:
+                mc, sh = palette.refs[k]
+                counts[key] = (n, mc, sh)
+            else:
+                counts[key] = (prev[0] + n, prev[1], prev[2])
 
         if counts:
             bucket_key, (bucket_n, bucket_main, bucket_shade) = max(
@@ -1091,50 +1778,78 @@ def paint_grid(
                     except Exception:
                         pass
 
+    # Optional region fill for Paint-by-Row: on top of the base fill, outline and
+    # bucket-fill large uniform rectangles found by a quadtree split of the grid.
+    rect_filled: set[int] = set()
+    if (
+        bucket_key is not None
+        and allow_region_bucket_fill
+        and bool(getattr(cfg, "bucket_fill_regions_enabled", False))
+        and max(0, int(getattr(cfg, "bucket_fill_regions_min_cells", 200))) > 0
+    ):
+        cell_matches: List[Optional[Tuple[MainColor, ShadeButton]]] = [refs[i] if i >= 0 else None for i in cell_idx]
+        rect_filled = _bucket_fill_uniform_rects(
+            cfg=cfg,
+            canvas_rect=canvas_rect,
+            grid_w=grid_w,
+            grid_h=grid_h,
+            cells=cells,
+            cell_matches=cell_matches,
+            base_key=bucket_key,
+            min_area=int(getattr(cfg, "bucket_fill_regions_min_cells", 200)),
+            options=options,
+            should_stop=should_stop,
+            status_cb=status_cb,
+            verify_cb=verify_cb,
+        )
+        if should_stop and should_stop():
+            return
+        _emit_progress_many(
+            [(i % grid_w, i // grid_w) for i in sorted(rect_filled)], progress_cb, progress_many_cb
+        )
+
+    # One byte per cell: 1 where a bucket fill already put the right shade down.
+    # Those cells are not painted. Base-fill cells are not sampled by row
+    # verification either, but rect-filled ones are (verify_skip): a rect fill
+    # is only checked along its outline and at one seed cell.
+    bucketed: Optional[bytearray] = None
+    verify_skip: Optional[bytes] = None
+    if bucket_key is not None:
+        base_id = first_of_key[bucket_key]
+        bucketed = bytearray(1 if k == base_id else 0 for k in cell_ids)
+        if rect_filled:
+            verify_skip = bytes(bucketed)
+            for i in rect_filled:
+                bucketed[i] = 1
+
     for y in range(grid_h):
         if status_cb is not None:
             try:
                 status_cb(f"Painting row {y+1}/{grid_h}…")
             except Exception:
                 pass
-        x = 0
-        while x < grid_w:
+        row_base = y * grid_w
+        plan = _plan_row(
+            cell_ids[row_base : row_base + grid_w],
+            bucketed[row_base : row_base + grid_w] if bucketed is not None else None,
+        )
+        for k, run_start, run_end in plan:
             if should_stop and should_stop():
                 return
 
-            if skip is not None and skip(x, y):
-                if progress_cb:
-                    progress_cb(x, y)
-                x += 1
-                continue
-
-            rgb = get_pixel(x, y)
-            match = get_match(rgb)
-            if match is None:
-                x += 1
-                continue
-            main, shade = match
-
-            if bucket_key is not None and (main.name, shade.pos) == bucket_key:
-                # Already bucket-filled.
-                if progress_cb:
-                    progress_cb(x, y)
-                x += 1
+            if k < 0:
+                # Skipped or already bucket-filled.
+                _emit_progress_many(
+                    [(xx, y) for xx in range(run_start, run_end + 1)], progress_cb, progress_many_cb
+                )
+                if streaming and rect_filled:
+                    for xx in range(run_start, run_end + 1):
+                        if row_base + xx in rect_filled:
+                            mr, sr = refs[cell_ids[row_base + xx]]
+                            verify_queue.append((xx, y, mr, sr))
+                    _stream_verify_flush(force=False)
                 continue
-
-            # Find run of adjacent same-shade pixels to potentially stroke.
-            run_start = x
-            run_end = x
-            while run_end + 1 < grid_w:
-                if skip is not None and skip(run_end + 1, y):
-                    break
-                nxt = get_match(get_pixel(run_end + 1, y))
-                if nxt is None:
-                    break
-                nmain, nshade = nxt
-                if nmain.name != main.name or nshade.pos != shade.pos:
-                    break
-                run_end += 1
+            main, shade = refs[k]
 
             # Select main color if changed
             last_main, last_shade, in_shades_panel = _select_shade(
@@ -1150,60 +1865,89 @@ def paint_grid(
             # Paint run
             run_len = run_end - run_start + 1
             if options.enable_drag_strokes and run_len >= 2:
-                pts: List[Point] = []
-                for xx in range(run_start, run_end + 1):
-                    cx = int(x0 + (xx + 0.5) * cell_w)
-                    cy = int(y0 + (y + 0.5) * cell_h)
-                    pts.append((cx, cy))
+                pts = _run_points(cells, y, run_start, run_end)
                 _rapid_click_stroke(pts, options, should_stop=should_stop)
-                if progress_cb:
-                    for xx in range(run_start, run_end + 1):
-                        progress_cb(xx, y)
+                _emit_progress_many(
+                    [(xx, y) for xx in range(run_start, run_end + 1)], progress_cb, progress_many_cb
+                )
                 if streaming:
                     for xx in range(run_start, run_end + 1):
                         verify_queue.append((int(xx), int(y), main, shade))
                     _stream_verify_flush(force=False)
-            else:
-                for xx in range(run_start, run_end + 1):
-                    cx = int(x0 + (xx + 0.5) * cell_w)
-                    cy = int(y0 + (y + 0.5) * cell_h)
-                    _tap((cx, cy), options)
+            elif progress_cb or streaming:
+                def _on_tap(idx: int) -> None:
+                    xx = run_start + idx
                     if progress_cb:
                         progress_cb(xx, y)
                     if streaming:
                         verify_queue.append((int(xx), int(y), main, shade))
                         _stream_verify_flush(force=False)
 
-            x = run_end + 1
+                _tap_many(_run_points(cells, y, run_start, run_end), options, on_point=_on_tap)
+            else:
+                _tap_many(_run_points(cells, y, run_start, run_end), options)
 
         if streaming:
             # Flush remaining lagging checks for this row.
             _stream_verify_flush(force=True)
         else:
-            # Verify the row after it's been attempted once.
-            row_expected: List[Optional[Tuple[MainColor, ShadeButton]]] = [None] * grid_w
-            for xx in range(grid_w):
-                if skip is not None and skip(xx, y):
-                    row_expected[xx] = None
-                    continue
-                m = get_match(get_pixel(xx, y))
-                row_expected[xx] = m
-            _verify_and_repair_row(
-                cfg=cfg,
-                canvas_rect=canvas_rect,
-                grid_w=grid_w,
-                grid_h=grid_h,
-                y=y,
-                row_expected=row_expected,
-                options=options,
-                progress_cb=progress_cb,
-                should_stop=should_stop,
-                status_cb=status_cb,
-                verify_cb=verify_cb,
-            )
+            # Verify the row after it's been attempted once. Expected shades are
+            # the painted runs of the plan (plus rect-filled cells); skipped and
+            # base-filled cells are simply gaps between runs.
+            verify_plan = plan
+            if verify_skip is not None:
+                verify_plan = _plan_row(cell_ids[row_base : row_base + grid_w], verify_skip[row_base : row_base + grid_w])
+            row_runs: List[Tuple[int, int, MainColor, ShadeButton]] = [
+                (run_start, run_end, refs[k][0], refs[k][1]) for k, run_start, run_end in verify_plan if k >= 0
+            ]
+
+            # Quick check with one grab of the row strip: rows that came out clean
+            # (the common case after a base bucket fill) skip the repair routine.
+            row_bad: Optional[List[int]] = None
+            if verify_rows and row_runs:
+                if not _sleep_with_stop(verify_settle_s, should_stop=should_stop):
+                    return
+                # This scan is verify pass 1; _verify_and_repair_row reuses it.
+                if status_cb is not None:
+                    try:
+                        status_cb(f"Verifying row {y+1}/{grid_h}… pass 1/{verify_max_passes}")
+                    except Exception:
+                        pass
+                row_bad = _row_mismatches(cells, y, row_runs, verify_tol2)
+                if not row_bad:
+                    row_runs = []
+
+            if row_runs or not verify_rows:
+                _verify_and_repair_row(
+                    cfg=cfg,
+                    grid_w=grid_w,
+                    grid_h=grid_h,
+                    cells=cells,
+                    y=y,
+                    row_runs=row_runs,
+                    options=options,
+                    progress_cb=progress_cb,
+                    should_stop=should_stop,
+                    status_cb=status_cb,
+                    verify_cb=verify_cb,
+                    initial_mismatches=row_bad,
+                )
+            else:
+                # Clean, or nothing to verify (fully skipped / bucket-filled):
+                # clear the previous row's verify marker either way.
+                _maybe_emit_verify(verify_cb, None, 0, every=1)
 
         if options.row_delay_s > 0:
-            if not _sleep_with_stop(options.row_delay_s, should_stop=should_stop):
+            # Wait on the row's last painted cell rather than sleeping blind;
+            # rows with nothing painted keep the plain delay.
+            last_run = next(((k, run_end) for k, _s, run_end in reversed(plan) if k >= 0), None)
+            if last_run is not None:
+                k, run_end = last_run
+                if not _wait_until_color(
+                    (cells.cxs[run_end], cells.cys[y]), refs[k][1].rgb, options.row_delay_s, verify_tol2, should_stop
+                ):
+                    return
+            elif not _sleep_with_stop(options.row_delay_s, should_stop=should_stop):
                 return
 
     # Leave the game UI in a predictable state.
@@ -1211,11 +1955,165 @@ def paint_grid(
         _tap(cfg.back_button_pos, options)
 
 
+def _take_component(
+    mask: bytearray,
+    grid_w: int,
+    grid_h: int,
+    seed: int,
+    interior_mask: Optional[bytearray] = None,
+    interior: Optional[List[int]] = None,
+) -> List[Tuple[int, int]]:
+    """Clear seed's 4-connected component from mask and return its cells (scanline fill).
+
+    mask holds one byte per grid cell (index y * grid_w + x), non-zero where a
+    cell is still unclaimed. Each popped seed is widened to its whole
+    horizontal span in one sweep; the rows above and below are then scanned
+    once across that span, pushing a new seed only where a run of set cells starts.
+
+    If interior_mask is given, cells set in it are appended to interior (as
+    ids) instead of being returned, so the result is only the boundary and no
+    second pass over the component is needed to split the two.
+    """
+
+    comp: List[Tuple[int, int]] = []
+    mask[seed] = 0
+    stack = [seed]
+    while stack:
+        i = stack.pop()
+        y, x = divmod(i, grid_w)
+        row = y * grid_w
+        xl = x
+        while xl > 0 and mask[row + xl - 1]:
+            xl -= 1
+            mask[row + xl] = 0
+        xr = x
+        while xr + 1 < grid_w and mask[row + xr + 1]:
+            xr += 1
+            mask[row + xr] = 0
+        if interior_mask is None:
+            comp.extend(zip(range(xl, xr + 1), repeat(y)))
+        else:
+            for j in range(row + xl, row + xr + 1):
+                if interior_mask[j]:
+                    interior.append(j)  # type: ignore[union-attr]
+                else:
+                    comp.append((j - row, y))
+        for ny in (y - 1, y + 1):
+            if ny < 0 or ny >= grid_h:
+                continue
+            nrow = ny * grid_w
+            in_run = False
+            for j in range(nrow + xl, nrow + xr + 1):
+                if mask[j]:
+                    if not in_run:
+                        mask[j] = 0
+                        stack.append(j)
+                        in_run = True
+                else:
+                    in_run = False
+    return comp
+
+
+def _rect_outline(x0: int, y0: int, x1: int, y1: int) -> Tuple[List[Point], List[Point]]:
+    """Split the cells of the inclusive box (x0, y0)-(x1, y1) into edge and inside, row-major."""
+
+    edge: List[Point] = []
+    inside: List[Point] = []
+    for y in range(y0, y1 + 1):
+        if y == y0 or y == y1:
+            edge.extend(zip(range(x0, x1 + 1), repeat(y)))
+        else:
+            edge.append((x0, y))
+            if x1 > x0:
+                inside.extend(zip(range(x0 + 1, x1), repeat(y)))
+                edge.append((x1, y))
+    return edge, inside
+
+
+def _erode_mask(mask: bytearray, grid_w: int, grid_h: int) -> bytearray:
+    """Return the cells of mask whose four neighbors are all set (cross erosion).
+
+    Cells are 0/1 bytes, so AND-ing the whole mask as one big integer against
+    copies of itself shifted by one cell and by one row is a byte-wise AND done
+    in C. Cells on the grid border never count as interior.
+    """
+
+    n = grid_w * grid_h
+    if grid_w < 3 or grid_h < 3:
+        return bytearray(n)
+    m = int.from_bytes(mask, "little")
+    inner_cols = int.from_bytes((b"\x00" + b"\x01" * (grid_w - 2) + b"\x00") * grid_h, "little")
+    row = 8 * grid_w
+    eroded = m & (m << 8) & (m >> 8) & (m << row) & (m >> row) & inner_cols
+    return bytearray(eroded.to_bytes(n, "little"))
+
+
+def _order_groups_for_selection(
+    groups: List[Tuple[MainColor, ShadeButton, array, array]],
+) -> List[Tuple[MainColor, ShadeButton, array, array]]:
+    """Order shade groups so _select_shade() switches main colors as little as possible.
+
+    Mains go by total cell count (most first); each main's shades stay together
+    and are visited greedily by nearest button position, starting from the
+    shade selected last. Ties keep most-used / first-seen order.
+    """
+
+    by_main: Dict[str, List[Tuple[MainColor, ShadeButton, array, array]]] = {}
+    # Stable sort by size first so every tie below falls back to "most-used first".
+    for g in sorted(groups, key=lambda t: -len(t[2])):
+        by_main.setdefault(g[0].name, []).append(g)
+    mains = sorted(by_main.values(), key=lambda gs: -sum(len(g[2]) for g in gs))
+
+    out: List[Tuple[MainColor, ShadeButton, array, array]] = []
+    for gs in mains:
+        todo = list(gs)
+        if out:
+            px, py = out[-1][1].pos
+            first = min(todo, key=lambda g: (g[1].pos[0] - px) ** 2 + (g[1].pos[1] - py) ** 2)
+        else:
+            first = todo[0]
+        todo.remove(first)
+        out.append(first)
+        while todo:
+            px, py = out[-1][1].pos
+            nxt = min(todo, key=lambda g: (g[1].pos[0] - px) ** 2 + (g[1].pos[1] - py) ** 2)
+            todo.remove(nxt)
+            out.append(nxt)
+    return out
+
+
+def _plan_row(row_ids: Sequence[int], row_done: Optional[Sequence[int]] = None) -> List[Tuple[int, int, int]]:
+    """Split one grid row into (id, x_start, x_end) spans, left to right.
+
+    row_ids holds a shade id per cell (-1 = skipped); row_done flags cells a
+    bucket fill already covered. Skipped/done stretches come back with id -1
+    (report progress only); everything else is a maximal run of one id to paint.
+    """
+
+    out: List[Tuple[int, int, int]] = []
+    n = len(row_ids)
+    x = 0
+    while x < n:
+        k = row_ids[x]
+        end = x
+        if k < 0 or (row_done is not None and row_done[x]):
+            k = -1
+            while end + 1 < n and (row_ids[end + 1] < 0 or (row_done is not None and row_done[end + 1])):
+                end += 1
+        else:
+            while end + 1 < n and row_ids[end + 1] == k and not (row_done is not None and row_done[end + 1]):
+                end += 1
+        out.append((k, x, end))
+        x = end + 1
+    return out
+
+
 def _paint_grid_by_color(
     cfg: AppConfig,
     canvas_rect: Tuple[int, int, int, int],
     grid_w: int,
     grid_h: int,
+    cells: _CellGrid,
     get_pixel: Callable[[int, int], RGB],
     options: PainterOptions,
     skip: Optional[Callable[[int, int], bool]] = None,
@@ -1228,6 +2126,8 @@ def _paint_grid_by_color(
     should_stop: Optional[Callable[[], bool]] = None,
     status_cb: Optional[Callable[[str], None]] = None,
     verify_cb: Optional[Callable[[Optional[Tuple[int, int]]], None]] = None,
+    progress_many_cb: Optional[Callable[[Sequence[Tuple[int, int]]], None]] = None,
+    pixels: Optional[Sequence[RGB]] = None,
 ) -> None:
     """Paint all pixels grouped by shade.
 
@@ -1235,48 +2135,77 @@ def _paint_grid_by_color(
     cells that need that shade before moving to the next.
     """
 
-    x0, y0, w, h = canvas_rect
     if grid_w <= 0 or grid_h <= 0:
         return
 
-    cell_w = w / grid_w
-    cell_h = h / grid_h
-
-    # Cache best-match results for repeated RGBs.
-    match_cache: Dict[RGB, Optional[Tuple[MainColor, ShadeButton]]] = {}
+    # Read tuning knobs once; the per-shade and per-component loops below only
+    # use these locals.
+    bucket_fill_enabled = bool(getattr(cfg, "bucket_fill_enabled", False))
+    bucket_min_cells = max(0, int(getattr(cfg, "bucket_fill_min_cells", 50)))
+    regions_cfg_enabled = bool(getattr(cfg, "bucket_fill_regions_enabled", False))
+    regions_min_cells = max(0, int(getattr(cfg, "bucket_fill_regions_min_cells", 200)))
+    verify_tol2 = max(0, int(getattr(cfg, "verify_tolerance", 35))) ** 2
+    settle_s = max(0.0, float(getattr(cfg, "verify_settle_s", 0.05)))
 
-    def get_match(rgb: RGB) -> Optional[Tuple[MainColor, ShadeButton]]:
-        if rgb in match_cache:
-            return match_cache[rgb]
-        m = _find_best_match(rgb, cfg)
-        match_cache[rgb] = m
-        return m
+    palette = _get_palette_index(cfg)
 
-    # Group: (main_name, shade_pos) -> (main, shade, [(x,y), ...])
-    groups: Dict[Tuple[str, Point], Tuple[MainColor, ShadeButton, List[Tuple[int, int]]]] = {}
+    # Group: (main_name, shade_pos) -> (main, shade, xs, ys)
+    # Coords are kept as parallel int16 arrays (~4 bytes/cell instead of a
+    # boxed tuple per cell); zip(xs, ys) yields (x, y) pairs when needed.
+    groups: Dict[Tuple[str, Point], Tuple[MainColor, ShadeButton, array, array]] = {}
 
     # Preprocess all pixels first so we know what to paint per shade.
+    cell_idx = _match_all(get_pixel, grid_w, grid_h, palette, skip=skip, should_stop=should_stop, pixels=pixels)
+    if cell_idx is None:
+        return
+    refs = palette.refs
+    keys = palette.keys
+    group_of: Dict[int, Tuple[MainColor, ShadeButton, array, array]] = {}
+    # Region fill needs each group as a grid mask. Rather than rebuild one from
+    # the group's coords, record every cell's group slot (1-based, 0 = not
+    # painted) in one shared byte grid here; a group's mask is then a single
+    # bytes.translate(). Dropped if there are more groups than a byte can tag.
+    slot_grid: Optional[bytearray] = None
+    group_slot: Dict[Tuple[str, Point], int] = {}
+    slot_tag: Dict[int, bytes] = {}
+    if allow_region_bucket_fill and regions_cfg_enabled:
+        slot_grid = bytearray(grid_w * grid_h)
+    # Walk each row as runs of one palette index and append whole runs, so the
+    # per-group bookkeeping happens once per run rather than once per cell.
     for y in range(grid_h):
-        for x in range(grid_w):
-            if should_stop and should_stop():
-                return
-            if skip is not None and skip(x, y):
-                continue
-            rgb = get_pixel(x, y)
-            match = get_match(rgb)
-            if match is None:
+        row_base = y * grid_w
+        row = cell_idx[row_base : row_base + grid_w]
+        bounds = [0]
+        bounds.extend(x for x in range(1, grid_w) if row[x] != row[x - 1])
+        bounds.append(grid_w)
+        for x_start, x_stop in zip(bounds, bounds[1:]):
+            k = row[x_start]
+            if k < 0:
                 continue
-            main, shade = match
-            key = (main.name, shade.pos)
-            if key not in groups:
-                groups[key] = (main, shade, [])
-            groups[key][2].append((x, y))
-
-    # Stable order: most-used shades first, then name/pos as tie-breaker.
-    ordered = sorted(
-        groups.values(),
-        key=lambda t: (-len(t[2]), t[0].name, t[1].pos[0], t[1].pos[1]),
-    )
+            g = group_of.get(k)
+            if g is None:
+                main, shade = refs[k]
+                key = keys[k]
+                g = groups.get(key)
+                if g is None:
+                    g = groups[key] = (main, shade, array("h"), array("h"))
+                    group_slot[key] = len(groups)
+                group_of[k] = g
+                if slot_grid is not None:
+                    if group_slot[key] > 255:
+                        slot_grid = None
+                    else:
+                        slot_tag[k] = bytes((group_slot[key],))
+            if slot_grid is not None:
+                slot_grid[row_base + x_start : row_base + x_stop] = slot_tag[k] * (x_stop - x_start)
+            if x_stop - x_start == 1:
+                g[2].append(x_start)
+                g[3].append(y)
+            else:
+                g[2].extend(range(x_start, x_stop))
+                g[3].extend(repeat(y, x_stop - x_start))
+
+    ordered = _order_groups_for_selection(list(groups.values()))
 
     # Optional bucket-fill: fill entire canvas with the most-used shade and then
     # skip painting that shade.
@@ -1287,10 +2216,10 @@ def _paint_grid_by_color(
     if resume_base_bucket_key is not None and resume_base_bucket_rgb is not None:
         bucket_key = resume_base_bucket_key
         base_rgb = resume_base_bucket_rgb
-    if allow_bucket_fill and bool(getattr(cfg, "bucket_fill_enabled", False)) and ordered:
-        main0, shade0, coords0 = ordered[0]
-        min_cells = max(0, int(getattr(cfg, "bucket_fill_min_cells", 50)))
-        if len(coords0) >= min_cells:
+    if allow_bucket_fill and bucket_fill_enabled and groups:
+        # Only the single most-used shade is a bucket candidate.
+        main0, shade0, xs0, ys0 = max(groups.values(), key=lambda t: len(t[2]))
+        if len(xs0) >= bucket_min_cells:
             if status_cb is not None:
                 try:
                     status_cb(f"Bucket-filling base canvas: {main0.name}/{shade0.name}…")
@@ -1321,11 +2250,9 @@ def _paint_grid_by_color(
                 except Exception:
                     pass
             # Mark these pixels as complete for progress purposes.
-            if progress_cb:
-                for xx, yy in coords0:
-                    progress_cb(xx, yy)
+            _emit_progress_many(list(zip(xs0, ys0)), progress_cb, progress_many_cb)
 
-    if allow_region_bucket_fill and bool(getattr(cfg, "bucket_fill_regions_enabled", False)) and bucket_key is None:
+    if allow_region_bucket_fill and regions_cfg_enabled and bucket_key is None:
         if status_cb is not None:
             try:
                 status_cb("Region fill disabled (needs base bucket-fill). Lower Bucket min cells or disable region fill.")
@@ -1337,13 +2264,12 @@ def _paint_grid_by_color(
     regions_enabled = (
         allow_region_bucket_fill
         and bucket_key is not None
-        and bool(getattr(cfg, "bucket_fill_regions_enabled", False))
+        and regions_cfg_enabled
         and cfg.paint_tool_button_pos is not None
         and cfg.bucket_tool_button_pos is not None
     )
-    regions_min_cells = max(0, int(getattr(cfg, "bucket_fill_regions_min_cells", 200)))
 
-    if allow_region_bucket_fill and bool(getattr(cfg, "bucket_fill_regions_enabled", False)) and bucket_key is not None:
+    if allow_region_bucket_fill and regions_cfg_enabled and bucket_key is not None:
         if cfg.paint_tool_button_pos is None or cfg.bucket_tool_button_pos is None:
             if status_cb is not None:
                 try:
@@ -1359,17 +2285,15 @@ def _paint_grid_by_color(
     streaming = bool(getattr(cfg, "verify_streaming_enabled", False)) and bool(getattr(cfg, "verify_rows", True))
     lag = max(0, int(getattr(cfg, "verify_streaming_lag", 10)))
     lag = min(lag, 200)
-    verify_tol = int(getattr(cfg, "verify_tolerance", 35))
-    verify_tol2 = max(0, verify_tol) ** 2
     verify_i = 0
 
-    for main, shade, coords in ordered:
+    if bucket_key is not None:
+        ordered = [g for g in ordered if (g[0].name, g[1].pos) != bucket_key]
+
+    for gi, (main, shade, xs, ys) in enumerate(ordered):
         if should_stop and should_stop():
             return
 
-        if bucket_key is not None and (main.name, shade.pos) == bucket_key:
-            continue
-
         # Use the unified selection logic (includes retries + UI sanity check).
         if status_cb is not None:
             try:
@@ -1388,11 +2312,36 @@ def _paint_grid_by_color(
 
         # If enabled, bucket-fill large connected regions by outlining first.
         # This is very fast when the canvas currently has a uniform base color.
+        coords = list(zip(xs, ys))
         remaining = coords
         if regions_enabled and regions_min_cells > 0 and len(coords) >= regions_min_cells:
-            coord_set = set(coords)
-
-            bucketed: set[Tuple[int, int]] = set()
+            # A group that exactly fills its bounding box (a plain block, common in
+            # pixel art) is a single component whose outline is the box edge, so
+            # it skips the masks and the component fill. ys is row-major.
+            bx0, bx1 = min(xs), max(xs)
+            by0, by1 = ys[0], ys[-1]
+            is_rect = len(coords) == (bx1 - bx0 + 1) * (by1 - by0 + 1)
+            if is_rect:
+                next_seed = 0
+            else:
+                # One byte per grid cell instead of a set of tuples: membership is
+                # an index, and the component pass clears cells as it claims them.
+                if slot_grid is not None:
+                    table = bytearray(256)
+                    table[group_slot[(main.name, shade.pos)]] = 1
+                    group_mask = slot_grid.translate(table)
+                else:
+                    group_mask = bytearray(grid_w * grid_h)
+                    for xx, yy in coords:
+                        group_mask[yy * grid_w + xx] = 1
+                unclaimed = bytearray(group_mask)
+                # Interior cells for every component at once; components are maximal,
+                # so a cell's neighbors in group_mask are all in its own component.
+                interior_mask = _erode_mask(group_mask, grid_w, grid_h)
+                next_seed = unclaimed.find(1)
+
+            # Bucket-filled cells, one byte per grid cell like the masks above.
+            bucketed = bytearray(grid_w * grid_h)
 
             comps_total = 0
             comps_small = 0
@@ -1402,45 +2351,32 @@ def _paint_grid_by_color(
             regions_total = 0
             regions_filled = 0
 
-            while coord_set:
+            while next_seed >= 0:
                 if should_stop and should_stop():
                     return
-                start = next(iter(coord_set))
-                stack = [start]
-                comp: List[Tuple[int, int]] = []
-                coord_set.remove(start)
-                while stack:
-                    px, py = stack.pop()
-                    comp.append((px, py))
-                    for nx, ny in ((px - 1, py), (px + 1, py), (px, py - 1), (px, py + 1)):
-                        if (nx, ny) in coord_set:
-                            coord_set.remove((nx, ny))
-                            stack.append((nx, ny))
+                if is_rect:
+                    boundary, inner = _rect_outline(bx0, by0, bx1, by1)
+                    interior_n = len(inner)
+                    next_seed = -1
+                else:
+                    # Boundary and interior are split during the fill itself. A
+                    # component never repeats a cell, so plain lists are enough.
+                    interior: List[int] = []
+                    boundary = _take_component(unclaimed, grid_w, grid_h, next_seed, interior_mask, interior)
+                    next_seed = unclaimed.find(1, next_seed)
+                    interior_n = len(interior)
+                comp_n = len(boundary) + interior_n
 
                 comps_total += 1
 
-                if len(comp) < regions_min_cells:
+                if comp_n < regions_min_cells:
                     comps_small += 1
                     continue
                 # Edge-touching components are allowed; the game canvas boundary
                 # acts as a hard stop, and we also verify the outline before
                 # bucket-filling to reduce spill risk.
 
-                comp_set = set(comp)
-                boundary: List[Tuple[int, int]] = []
-                interior: Optional[Tuple[int, int]] = None
-                for px, py in comp:
-                    is_boundary = False
-                    for nx, ny in ((px - 1, py), (px + 1, py), (px, py - 1), (px, py + 1)):
-                        if (nx, ny) not in comp_set:
-                            is_boundary = True
-                            break
-                    if is_boundary:
-                        boundary.append((px, py))
-                    elif interior is None:
-                        interior = (px, py)
-
-                if interior is None:
+                if not interior_n:
                     # No interior (thin shape) -> not worth bucket filling.
                     comps_no_interior += 1
                     continue
@@ -1448,15 +2384,13 @@ def _paint_grid_by_color(
                 # Outline boundary pixels with the target shade (paint tool).
                 if status_cb is not None:
                     try:
-                        status_cb(f"Region fill: outlining {len(boundary)} px, filling {len(comp)} px…")
+                        status_cb(f"Region fill: outlining {len(boundary)} px, filling {comp_n} px…")
                     except Exception:
                         pass
                 _tap(cfg.paint_tool_button_pos, options)
                 _paint_coord_runs(
                     cfg=cfg,
-                    canvas_rect=canvas_rect,
-                    grid_w=grid_w,
-                    grid_h=grid_h,
+                    cells=cells,
                     coords=boundary,
                     options=options,
                     progress_cb=None,
@@ -1469,6 +2403,7 @@ def _paint_grid_by_color(
                     canvas_rect=canvas_rect,
                     grid_w=grid_w,
                     grid_h=grid_h,
+                    cells=cells,
                     outline_coords=boundary,
                     expected_rgb=None,
                     avoid_rgb=base_rgb,
@@ -1489,71 +2424,56 @@ def _paint_grid_by_color(
                 if should_stop and should_stop():
                     return
 
-                boundary_set = set(boundary)
-                interior_set = set(comp_set) - boundary_set
-                if not interior_set:
-                    comps_no_interior += 1
-                    continue
-
                 # Find interior connected components (tight outlines can split interior
                 # into multiple enclosed regions that need multiple bucket clicks).
                 interior_components: List[List[Tuple[int, int]]] = []
-                while interior_set:
-                    seed = next(iter(interior_set))
-                    stack2 = [seed]
-                    interior_set.remove(seed)
-                    sub: List[Tuple[int, int]] = []
-                    while stack2:
-                        qx, qy = stack2.pop()
-                        sub.append((qx, qy))
-                        for nx, ny in ((qx - 1, qy), (qx + 1, qy), (qx, qy - 1), (qx, qy + 1)):
-                            if (nx, ny) in interior_set:
-                                interior_set.remove((nx, ny))
-                                stack2.append((nx, ny))
-                    interior_components.append(sub)
+                if is_rect:
+                    interior_components.append(inner)
+                else:
+                    for i in interior:
+                        if interior_mask[i]:
+                            interior_components.append(_take_component(interior_mask, grid_w, grid_h, i))
 
                 # Bucket-fill each enclosed interior subregion.
-                tol = int(getattr(cfg, "verify_tolerance", 35))
-                tol2 = max(0, tol) ** 2
-                settle_s = max(0.0, float(getattr(cfg, "verify_settle_s", 0.05)))
-
                 _tap(cfg.bucket_tool_button_pos, options)
-                filled_cells: set[Tuple[int, int]] = set(boundary)
+                # boundary isn't needed past this point; grow it in place.
+                filled_cells = boundary
 
                 regions_total += len(interior_components)
                 filled_any = False
+                tapped: List[List[Tuple[int, int]]] = []
                 for sub in interior_components:
                     if should_stop and should_stop():
                         return
                     if not sub:
                         continue
                     fx, fy = sub[0]
-                    _tap(_cell_center(canvas_rect, grid_w, grid_h, fx, fy), options)
-                    if settle_s > 0:
-                        if not _sleep_with_stop(settle_s, should_stop=should_stop):
-                            return
-
-                    ok = True
-                    # Spot-check that the click actually filled (cell should not remain base).
-                    if base_rgb is not None:
-                        cx, cy = _cell_center(canvas_rect, grid_w, grid_h, fx, fy)
-                        actual = get_screen_pixel_rgb(cx, cy)
-                        if _dist2(actual, base_rgb) <= tol2:
-                            ok = False
-
-                    if ok:
+                    _tap(_cell_center(cells, fx, fy), options)
+                    tapped.append(sub)
+
+                if settle_s > 0:
+                    if not _sleep_with_stop(settle_s, should_stop=should_stop):
+                        return
+
+                # Spot-check that each click actually filled (seed cell should not
+                # remain base), using one canvas grab for the whole batch.
+                still_base = [False] * len(tapped)
+                if base_rgb is not None and tapped:
+                    seeds = [_cell_center(cells, sub[0][0], sub[0][1]) for sub in tapped]
+                    still_base = _canvas_near_mask(canvas_rect, seeds, base_rgb, verify_tol2)
+                for sub, failed in zip(tapped, still_base):
+                    if not failed:
                         filled_any = True
                         regions_filled += 1
-                        filled_cells |= set(sub)
+                        filled_cells.extend(sub)
 
                 _tap(cfg.paint_tool_button_pos, options)
 
                 if filled_any:
                     comps_filled += 1
-                    bucketed |= filled_cells
-                    if progress_cb:
-                        for xx, yy in filled_cells:
-                            progress_cb(xx, yy)
+                    for xx, yy in filled_cells:
+                        bucketed[yy * grid_w + xx] = 1
+                    _emit_progress_many(filled_cells, progress_cb, progress_many_cb)
                 else:
                     # Nothing filled; leave these cells for normal painting.
                     if status_cb is not None:
@@ -1576,8 +2496,9 @@ def _paint_grid_by_color(
                 except Exception:
                     pass
 
-            if bucketed:
-                remaining = [xy for xy in coords if xy not in bucketed]
+            if comps_filled:
+                # coords is row-major already, which is what _paint_coord_runs wants.
+                remaining = [xy for xy in coords if not bucketed[xy[1] * grid_w + xy[0]]]
         elif regions_enabled and regions_min_cells > 0 and len(coords) < regions_min_cells:
             if status_cb is not None:
                 try:
@@ -1607,29 +2528,32 @@ def _paint_grid_by_color(
             nonlocal verify_i
             if not streaming:
                 return
-            steps = 0
-            while verify_queue and (force or len(verify_queue) > lag):
-                if not force and steps >= max(1, int(max_steps)):
-                    break
+            er, eg, eb = shade.rgb
+            n = len(verify_queue) if force else min(len(verify_queue) - lag, max(1, int(max_steps)))
+            if n > 0:
                 if should_stop and should_stop():
                     return
-                x, y = verify_queue.popleft()
-                cx, cy = _cell_center(canvas_rect, grid_w, grid_h, int(x), int(y))
-                verify_i += 1
-                _maybe_emit_verify(verify_cb, (int(x), int(y)), verify_i, every=1)
+                # One grab around the cells due, not a 1x1 grab per cell.
+                batch = [verify_queue.popleft() for _ in range(n)]
+                pts = [_cell_center(cells, int(x), int(y)) for x, y in batch]
                 try:
-                    actual = get_screen_pixel_rgb(cx, cy)
+                    samples: Optional[List[RGB]] = get_screen_pixels_rgb(pts)
                 except Exception:
-                    steps += 1
-                    continue
-                if _dist2(actual, shade.rgb) <= verify_tol2:
-                    steps += 1
-                    continue
-                # Mismatch: we expect the currently-selected shade, so just tap again.
-                _tap((cx, cy), options)
-                if progress_cb:
-                    progress_cb(int(x), int(y))
-                steps += 1
+                    samples = None
+                for i, (x, y) in enumerate(batch):
+                    if should_stop and should_stop():
+                        return
+                    verify_i += 1
+                    _maybe_emit_verify(verify_cb, (int(x), int(y)), verify_i, every=1)
+                    if samples is None:
+                        continue
+                    ar, ag, ab = samples[i]
+                    if _dist2_raw(ar, ag, ab, er, eg, eb) <= verify_tol2:
+                        continue
+                    # Mismatch: we expect the currently-selected shade, so just tap again.
+                    _tap(pts[i], options)
+                    if progress_cb:
+                        progress_cb(int(x), int(y))
             if force:
                 # If this takes a while, keep the user informed in the status overlay.
                 if status_cb is not None:
@@ -1659,9 +2583,7 @@ def _paint_grid_by_color(
 
         _paint_coord_runs(
             cfg=cfg,
-            canvas_rect=canvas_rect,
-            grid_w=grid_w,
-            grid_h=grid_h,
+            cells=cells,
             coords=list(remaining),
             options=options,
             progress_cb=progress_and_stream if streaming else progress_cb,
@@ -1674,11 +2596,9 @@ def _paint_grid_by_color(
         # If streaming is enabled, we've already been verifying/repainting as we
         # go. Skip the heavier post-pass verification.
         if not streaming:
-            _verify_and_repair_color_group(
+            last_main, last_shade, in_shades_panel = _verify_and_repair_color_group(
                 cfg=cfg,
-                canvas_rect=canvas_rect,
-                grid_w=grid_w,
-                grid_h=grid_h,
+                cells=cells,
                 main=main,
                 shade=shade,
                 coords=list(remaining),
@@ -1687,19 +2607,38 @@ def _paint_grid_by_color(
                 should_stop=should_stop,
                 status_cb=status_cb,
                 verify_cb=verify_cb,
+                last_main=last_main,
+                last_shade=last_shade,
+                in_shades_panel=in_shades_panel,
             )
 
         # Keep UI state and our state in sync. The shades panel is typically left
         # open after selecting a shade; close it between groups so the next main
-        # selection is reliable.
-        if in_shades_panel:
-            _tap(cfg.back_button_pos, options)
-            in_shades_panel = False
-        last_main = None
-        last_shade = None
+        # selection is reliable. Groups are ordered by main color, so when the
+        # next group shares this main the panel stays open and only the shade
+        # button changes.
+        next_main = ordered[gi + 1][0] if gi + 1 < len(ordered) else None
+        if next_main is None or next_main.name != main.name:
+            if in_shades_panel:
+                _tap(cfg.back_button_pos, options)
+                in_shades_panel = False
+            last_main = None
+            last_shade = None
 
         if options.row_delay_s > 0:
-            time.sleep(options.row_delay_s)
+            # As in row mode, end the delay once a painted cell of the group shows its shade.
+            if remaining:
+                lx, ly = remaining[-1]
+                if not _wait_until_color(
+                    _cell_center(cells, lx, ly),
+                    shade.rgb,
+                    options.row_delay_s,
+                    verify_tol2,
+                    should_stop,
+                ):
+                    return
+            else:
+                time.sleep(options.row_delay_s)
 
     if in_shades_panel:
         _tap(cfg.back_button_pos, options)
@@ -1,30 +1,118 @@
 from __future__ import annotations
 
-from typing import Tuple
+import threading
+from dataclasses import dataclass
+from typing import Any, List, Sequence, Tuple
 
 import mss
 
 
+RGB = Tuple[int, int, int]
+
+# mss handles are tied to the thread that created them (GDI DC / X display),
+# so keep one per thread rather than one global.
+_tls = threading.local()
+
+
+def _shared_sct() -> Any:
+    sct = getattr(_tls, "sct", None)
+    if sct is None:
+        sct = _tls.sct = mss.mss()
+    return sct
+
+
+def release_screen_handle() -> None:
+    """Close the calling thread's mss handle, if it has one.
+
+    Call this at the end of a worker thread that sampled the screen; the
+    handle is reopened on the next grab from that thread.
+    """
+    sct = getattr(_tls, "sct", None)
+    _tls.sct = None
+    if sct is not None:
+        try:
+            sct.close()
+        except Exception:
+            pass
+
+
+@dataclass
+class ScreenFrame:
+    """RGB snapshot of a screen rectangle, addressed in absolute screen coordinates."""
+
+    left: int
+    top: int
+    width: int
+    height: int
+    rgb: bytes  # row-major, 3 bytes per pixel (R, G, B)
+
+    def get(self, x: int, y: int) -> RGB:
+        i = ((y - self.top) * self.width + (x - self.left)) * 3
+        rgb = self.rgb
+        return (rgb[i], rgb[i + 1], rgb[i + 2])
+
+
+def _grab(monitor: dict) -> Any:
+    # Reuse this thread's mss handle instead of opening a new one per grab. If
+    # the handle went stale (e.g. display change), reopen it once before giving up.
+    try:
+        return _shared_sct().grab(monitor)
+    except Exception:
+        release_screen_handle()
+        return _shared_sct().grab(monitor)
+
+
 def get_screen_pixel_rgb(x: int, y: int) -> Tuple[int, int, int]:
     """Fast 1x1 pixel sample from the screen at absolute coordinates."""
-    with mss.mss() as sct:
-        monitor = {"left": x, "top": y, "width": 1, "height": 1}
-        img = sct.grab(monitor)
-        # Use the raw RGB bytes from mss to avoid backend-dependent channel order.
-        # For a 1x1 grab, this is exactly 3 bytes: R, G, B.
-        rgb_bytes = getattr(img, "rgb", None)
-        if rgb_bytes is not None and len(rgb_bytes) >= 3:
-            r = rgb_bytes[0]
-            g = rgb_bytes[1]
-            b = rgb_bytes[2]
-            return (int(r), int(g), int(b))
-
-        # Fallback: try pixel(), assuming BGRA/BGR ordering.
-        px = img.pixel(0, 0)
-        if len(px) == 4:
-            b, g, r, _a = px
-            return (int(r), int(g), int(b))
-        if len(px) == 3:
-            b, g, r = px
-            return (int(r), int(g), int(b))
-        raise ValueError(f"Unexpected pixel format length: {len(px)}")
+    monitor = {"left": x, "top": y, "width": 1, "height": 1}
+    img = _grab(monitor)
+    # Use the raw RGB bytes from mss to avoid backend-dependent channel order.
+    # For a 1x1 grab, this is exactly 3 bytes: R, G, B.
+    rgb_bytes = getattr(img, "rgb", None)
+    if rgb_bytes is not None and len(rgb_bytes) >= 3:
+        r = rgb_bytes[0]
+        g = rgb_bytes[1]
+        b = rgb_bytes[2]
+        return (int(r), int(g), int(b))
+
+    # Fallback: try pixel(), assuming BGRA/BGR ordering.
+    px = img.pixel(0, 0)
+    if len(px) == 4:
+        b, g, r, _a = px
+        return (int(r), int(g), int(b))
+    if len(px) == 3:
+        b, g, r = px
+        return (int(r), int(g), int(b))
+    raise ValueError(f"Unexpected pixel format length: {len(px)}")
+
+
+def get_screen_pixels_rgb(points: Sequence[Tuple[int, int]]) -> List[RGB]:
+    """Sample several screen points with one grab of their bounding box.
+
+    Returns one RGB per point, in order. Meant for points that sit close
+    together (a few cells of the canvas); far-apart points still work but
+    pull in everything between them.
+    """
+    if not points:
+        return []
+    if len(points) == 1:
+        return [get_screen_pixel_rgb(int(points[0][0]), int(points[0][1]))]
+    xs = [int(p[0]) for p in points]
+    ys = [int(p[1]) for p in points]
+    left = min(xs)
+    top = min(ys)
+    frame = grab_screen_rect(left, top, max(xs) - left + 1, max(ys) - top + 1)
+    return [frame.get(x, y) for x, y in zip(xs, ys)]
+
+
+def grab_screen_rect(left: int, top: int, width: int, height: int) -> ScreenFrame:
+    """Capture a whole screen rectangle in one grab.
+
+    Much cheaper than calling get_screen_pixel_rgb() per pixel when many
+    pixels inside the same area need to be sampled.
+    """
+    width = max(1, int(width))
+    height = max(1, int(height))
+    monitor = {"left": int(left), "top": int(top), "width": width, "height": height}
+    img = _grab(monitor)
+    return ScreenFrame(left=int(left), top=int(top), width=width, height=height, rgb=bytes(img.rgb))